@@ -486,7 +486,10 @@ class PredictiveAnalyticsEngine:
         extracted_texts = []
         visual_features = []
 
-        for img_file in files_dir.glob("*.png"):
+        # Screenshots podem ser PNG ou JPEG (o extrator Playwright grava .jpg por padrão)
+        image_files = [f for f in files_dir.iterdir() if f.suffix.lower() in ('.png', '.jpg', '.jpeg')]
+
+        for img_file in image_files:
             try:
                 logger.info(f"🔍 Analisando imagem: {img_file.name}")
                 
@@ -525,7 +525,7 @@ def get_workflow_results(session_id):
         # Conta screenshots
         files_dir = f"analyses_data/files/{session_id}"
         if os.path.exists(files_dir):
-            screenshots = [f for f in os.listdir(files_dir) if f.endswith('.png')]
+            screenshots = [f for f in os.listdir(files_dir) if f.lower().endswith(('.png', '.jpg', '.jpeg'))]
             results["screenshots_captured"] = len(screenshots)
             results["screenshots_list"] = screenshots
 
@@ -30,9 +30,25 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
+def _install_event_loop():
+    """Usa uvloop (libuv) nos event loops do processo, quando disponível
+
+    Reduz o custo de agendamento das muitas corrotinas de rede (extração Playwright,
+    workflows); indisponível no Windows, onde o loop padrão do asyncio continua sendo usado.
+    """
+    try:
+        import uvloop
+    except ImportError:
+        return
+    uvloop.install()
+    logger.info("⚡ Event loop uvloop ativado")
+
 def create_app():
     """Cria e configura a aplicação Flask"""
 
+    # Política de event loop definida uma vez pela aplicação, antes de qualquer serviço criar loops
+    _install_event_loop()
+
     # Carrega variáveis de ambiente
     from services.environment_loader import environment_loader
 
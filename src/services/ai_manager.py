@@ -401,8 +401,8 @@ class AIManager:
         
         return formatted
 
-    async def generate_text(self, prompt: str, max_tokens: int = 8192, temperature: float = 0.7) -> str:
-        """Gera texto usando o melhor provedor disponível"""
+    async def generate_text(self, prompt: str, max_tokens: int = 8192, temperature: float = 0.7, json_mode: bool = False) -> str:
+        """Gera texto usando o melhor provedor disponível (json_mode pede saída JSON estruturada ao provedor)"""
         provider_name = self._get_available_provider()
         
         if not provider_name:
@@ -414,9 +414,9 @@ class AIManager:
             start_time = time.time()
             
             if provider_name == 'gemini':
-                result = await self._generate_gemini(prompt, max_tokens, temperature)
+                result = await self._generate_gemini(prompt, max_tokens, temperature, json_mode)
             elif provider_name == 'openai':
-                result = await self._generate_openai(prompt, max_tokens, temperature)
+                result = await self._generate_openai(prompt, max_tokens, temperature, json_mode)
             elif provider_name == 'groq':
                 result = provider['client'].generate(prompt, max_tokens)
             else:
@@ -442,17 +442,19 @@ class AIManager:
             if provider['consecutive_failures'] >= provider['max_errors']:
                 provider['available'] = False
                 logger.warning(f"⚠️ {provider_name} desabilitado temporariamente")
-                return await self.generate_text(prompt, max_tokens, temperature)
+                return await self.generate_text(prompt, max_tokens, temperature, json_mode)
             
             raise
 
-    async def _generate_gemini(self, prompt: str, max_tokens: int, temperature: float) -> str:
+    async def _generate_gemini(self, prompt: str, max_tokens: int, temperature: float, json_mode: bool = False) -> str:
         """Gera texto usando Gemini"""
         model = genai.GenerativeModel('gemini-2.0-flash-exp')
         
         generation_config = genai.types.GenerationConfig(
             max_output_tokens=max_tokens,
             temperature=temperature,
+            # Saída JSON nativa: dispensa extração por regex/cercas de código
+            response_mime_type="application/json" if json_mode else None,
         )
         
         response = model.generate_content(
@@ -462,13 +464,15 @@ class AIManager:
         
         return response.text
 
-    async def _generate_openai(self, prompt: str, max_tokens: int, temperature: float) -> str:
+    async def _generate_openai(self, prompt: str, max_tokens: int, temperature: float, json_mode: bool = False) -> str:
         """Gera texto usando OpenAI"""
+        extra_params = {"response_format": {"type": "json_object"}} if json_mode else {}
         response = openai.ChatCompletion.create(
             model="gpt-4-0125-preview",
             messages=[{"role": "user", "content": prompt}],
             max_tokens=max_tokens,
-            temperature=temperature
+            temperature=temperature,
+            **extra_params
         )
         
         return response.choices[0].message.content
@@ -13,6 +13,12 @@ from datetime import datetime
 from typing import Dict, List, Any, Optional
 from pathlib import Path
 
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
 logger = logging.getLogger(__name__)
 
 # Import do serviço preditivo (lazy loading para evitar circular imports)
@@ -49,6 +55,12 @@ def serializar_dados_seguros(dados: Any) -> Dict[str, Any]:
     serializable_data["timestamp"] = datetime.now().isoformat()
     return serializable_data
 
+def dumps_json_bytes(dados: Any) -> bytes:
+    """Serializa para JSON indentado em UTF-8, usando orjson (C) quando disponível"""
+    if HAS_ORJSON:
+        return orjson.dumps(dados, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(dados, ensure_ascii=False, indent=2).encode('utf-8')
+
 class AutoSaveManager:
     """Gerenciador de salvamento automático ultra-robusto"""
 
@@ -134,8 +146,11 @@ class AutoSaveManager:
                         "original_data": dados_serializaveis
                     }
 
-                with open(arquivo_json, 'w', encoding='utf-8') as f:
-                    json.dump(dados_serializaveis, f, ensure_ascii=False, indent=2)
+                # Serializa uma única vez; o mesmo buffer é gravado em todos os destinos
+                conteudo_json = dumps_json_bytes(dados_serializaveis)
+
+                with open(arquivo_json, 'wb') as f:
+                    f.write(conteudo_json)
 
                 logger.info(f"💾 Etapa '{nome_etapa}' salva: {arquivo_json}")
 
@@ -163,8 +178,8 @@ class AutoSaveManager:
                         analyses_arquivo_nome = f"{nome_modulo_base}_{timestamp}.json" if session_id is None else f"{nome_modulo_base}_{session_id}_{timestamp}.json"
                         analyses_arquivo = os.path.join(analyses_dir, analyses_arquivo_nome)
 
-                        with open(analyses_arquivo, 'w', encoding='utf-8') as f:
-                            json.dump(dados_serializaveis, f, ensure_ascii=False, indent=2)
+                        with open(analyses_arquivo, 'wb') as f:
+                            f.write(conteudo_json)
 
                         logger.info(f"💾 Módulo também salvo em analyses_data: {analyses_arquivo}")
 
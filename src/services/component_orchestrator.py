@@ -8,11 +8,26 @@ Orquestrador seguro de componentes com validação rigorosa
 import logging
 import time
 import json
+import re
 from typing import Dict, List, Any, Optional, Callable
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
+# Indicadores de conteúdo falso/genérico
+_FALLBACK_INDICATORS = (
+    'em desenvolvimento', 'fallback', 'não disponível', 'erro na',
+    'driver 1', 'driver 2', 'customizado para', 'baseado em',
+    'específico para', 'dados não disponíveis', 'análise em desenvolvimento',
+    'erro na geração', 'unknown field'
+)
+
+# Uma única varredura para todos os indicadores (mais longos primeiro, para relatar o mais específico)
+_FALLBACK_PATTERN = re.compile(
+    '|'.join(re.escape(indicator) for indicator in sorted(_FALLBACK_INDICATORS, key=len, reverse=True)),
+    re.IGNORECASE
+)
+
 class ComponentValidationError(Exception):
     """Exceção para erros de validação de componentes"""
     pass
@@ -235,17 +250,9 @@ class ComponentOrchestrator:
 
             # Verifica se conteúdo não é fallback/genérico
             if isinstance(result, dict):
-                result_str = json.dumps(result, ensure_ascii=False).lower()
-
-                # Indicadores de conteúdo falso/genérico
-                fallback_indicators = [
-                    'em desenvolvimento', 'fallback', 'não disponível', 'erro na',
-                    'driver 1', 'driver 2', 'customizado para', 'baseado em',
-                    'específico para', 'dados não disponíveis', 'análise em desenvolvimento',
-                    'erro na geração', 'unknown field'
-                ]
+                result_str = json.dumps(result, ensure_ascii=False)
 
-                found_fallback = [indicator for indicator in fallback_indicators if indicator in result_str]
+                found_fallback = sorted({match.lower() for match in _FALLBACK_PATTERN.findall(result_str)})
 
                 if found_fallback:
                     logger.warning(f"⚠️ Conteúdo genérico/fallback detectado em {component_name}: {found_fallback}")
@@ -7,18 +7,122 @@ Sistema de consolidação que NUNCA falha e sempre gera relatório
 
 import os
 import logging
-import time
 import json
 from datetime import datetime
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Iterator, Callable, TextIO, Union
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 from services.auto_save_manager import auto_save_manager, salvar_etapa, salvar_erro
 
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
 logger = logging.getLogger(__name__)
 
+_HTML_TEMPLATE = """<!DOCTYPE html>
+<html lang="pt-BR">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>Relatório ARQV30 - {session_id}</title>
+    <style>
+        body {{ font-family: Arial, sans-serif; margin: 40px; background: #f5f5f5; }}
+        .container {{ max-width: 1200px; margin: 0 auto; background: white; padding: 40px; border-radius: 10px; box-shadow: 0 4px 6px rgba(0,0,0,0.1); }}
+        h1 {{ color: #2c3e50; border-bottom: 3px solid #3498db; padding-bottom: 10px; }}
+        h2 {{ color: #34495e; margin-top: 30px; }}
+        .metric {{ background: #ecf0f1; padding: 15px; margin: 10px 0; border-radius: 5px; }}
+        .insight {{ background: #e8f5e8; padding: 10px; margin: 5px 0; border-left: 4px solid #27ae60; }}
+        .warning {{ background: #fdf2e9; padding: 10px; margin: 5px 0; border-left: 4px solid #f39c12; }}
+        .error {{ background: #fadbd8; padding: 10px; margin: 5px 0; border-left: 4px solid #e74c3c; }}
+    </style>
+</head>
+<body>
+    <div class="container">
+        <h1>📊 Relatório de Análise Ultra-Detalhada</h1>
+        <p><strong>Sessão:</strong> {session_id}</p>
+        <p><strong>Data:</strong> {timestamp}</p>
+        <p><strong>Tipo:</strong> {tipo}</p>
+{resumo_block}{insights_block}
+    </div>
+</body>
+</html>"""
+
+_HTML_RESUMO_BLOCK = """
+        <h2>📋 Resumo Executivo</h2>
+        <div class="metric">
+            <strong>Segmento:</strong> {segmento}<br>
+            <strong>Produto/Serviço:</strong> {produto}<br>
+            <strong>Qualidade:</strong> {qualidade:.1f}%<br>
+            <strong>Componentes:</strong> {componentes}
+        </div>
+"""
+
+def _escrever_bytes(caminho: str, dados: bytes) -> None:
+    """Escreve bytes com os.open/os.write, sem a camada de buffer de texto"""
+    fd = os.open(caminho, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        visao = memoryview(dados)
+        while visao:
+            visao = visao[os.write(fd, visao):]
+    finally:
+        os.close(fd)
+
+def _dig(dados: Any, *chaves: Any, default: Any = None) -> Any:
+    """Acessa chaves aninhadas sem criar dicts vazios a cada ausência"""
+    try:
+        for chave in chaves:
+            dados = dados[chave]
+        return dados
+    except (KeyError, IndexError, TypeError):
+        return default
+
+def _varrer_arquivos_sessao(raiz: str, session_id: str) -> Iterator[os.DirEntry]:
+    """Percorre recursivamente `raiz` com os.scandir, gerando apenas arquivos da sessão"""
+    pilha = [raiz]
+    while pilha:
+        with os.scandir(pilha.pop()) as entradas:
+            for entrada in entradas:
+                if entrada.is_dir(follow_symlinks=False):
+                    pilha.append(entrada.path)
+                elif session_id in entrada.name and entrada.is_file():
+                    yield entrada
+
 class ConsolidacaoFinal:
     """Sistema de consolidação final ultra-robusto"""
     
+    # Formatos gerados, resolvidos para _generate_<formato>_report
+    _FORMATOS = ('markdown', 'html', 'json', 'minimal')
+    
+    _COMPONENTES_PRINCIPAIS = (
+        'projeto_dados', 'pesquisa_web_massiva', 'avatar_ultra_detalhado',
+        'drivers_mentais_customizados', 'provas_visuais_sugeridas',
+        'sistema_anti_objecao', 'pre_pitch_invisivel', 'predicoes_futuro_completas',
+        'insights_exclusivos'
+    )
+    
+    _COMPONENTES_ESPERADOS = (
+        'pesquisa_web_massiva', 'avatar_ultra_detalhado', 'drivers_mentais_customizados',
+        'provas_visuais_sugeridas', 'sistema_anti_objecao', 'pre_pitch_invisivel'
+    )
+    
+    _EXTENSOES = {
+        'markdown': '.md',
+        'html': '.html',
+        'json': '.json',
+        'minimal': '.txt'
+    }
+    
+    # (chave na validação, chave do limite, rótulo do problema)
+    _CRITERIOS_QUALIDADE = (
+        ('drivers_mentais_count', 'min_drivers_mentais', 'Drivers mentais'),
+        ('provas_visuais_count', 'min_provas_visuais', 'Provas visuais'),
+        ('pesquisa_fontes', 'min_fontes_pesquisa', 'Fontes de pesquisa'),
+        ('insights_count', 'min_insights', 'Insights')
+    )
+    
     def __init__(self):
         """Inicializa sistema de consolidação"""
         self.quality_thresholds = {
@@ -29,13 +133,6 @@ class ConsolidacaoFinal:
             'min_content_length': 1000
         }
         
-        self.template_engines = {
-            'markdown': self._generate_markdown_report,
-            'html': self._generate_html_report,
-            'json': self._generate_json_report,
-            'minimal': self._generate_minimal_report
-        }
-        
         logger.info("Consolidação Final Ultra-Robusta inicializada")
     
     def consolidar_analise_completa(
@@ -46,38 +143,54 @@ class ConsolidacaoFinal:
     ) -> Dict[str, Any]:
         """Consolida análise completa com fallbacks robustos"""
         
+        # Timestamp único para todos os metadados desta consolidação
+        agora = datetime.now()
+        now_iso = agora.isoformat()
+        
         try:
             logger.info(f"🔄 Iniciando consolidação final para sessão: {session_id}")
             
             # Salva início da consolidação
             salvar_etapa("consolidacao_iniciada", {
                 "session_id": session_id,
-                "timestamp": time.time(),
+                "timestamp": agora.timestamp(),
                 "force_minimal": force_minimal
             }, categoria="analise_completa")
             
-            # 1. Coleta todos os dados disponíveis
-            dados_coletados = self._coletar_todos_dados(dados_pipeline, session_id)
+            # Listagem única dos arquivos intermediários, reaproveitada na coleta e nos metadados
+            arquivos_intermediarios = self._listar_arquivos_intermediarios(session_id)
             
-            # 2. Valida qualidade dos dados
-            validacao_qualidade = self._validar_qualidade_dados(dados_coletados)
-            salvar_etapa("validacao_qualidade", validacao_qualidade, categoria="analise_completa")
+            if force_minimal:
+                # Caminho rápido: relatório mínimo não depende das etapas salvas nem da validação
+                logger.warning("⚠️ Modo mínimo forçado - gerando relatório mínimo sem recuperar etapas")
+                validacao_qualidade = self._validacao_modo_minimo()
+                relatorio_final = self._gerar_relatorio_minimo_rapido(
+                    dados_pipeline, session_id, validacao_qualidade, now_iso, arquivos_intermediarios
+                )
             
-            # 3. Determina tipo de relatório baseado na qualidade
-            if force_minimal or not validacao_qualidade['qualidade_suficiente']:
-                logger.warning("⚠️ Qualidade insuficiente ou modo mínimo forçado - gerando relatório mínimo")
-                relatorio_final = self._gerar_relatorio_minimo(dados_coletados, session_id, validacao_qualidade)
             else:
-                logger.info("✅ Qualidade suficiente - gerando relatório completo")
-                relatorio_final = self._gerar_relatorio_completo(dados_coletados, session_id, validacao_qualidade)
+                # 1. Coleta todos os dados disponíveis
+                dados_coletados = self._coletar_todos_dados(dados_pipeline, session_id, arquivos_intermediarios)
+                
+                # 2. Valida qualidade dos dados
+                validacao_qualidade = self._validar_qualidade_dados(dados_coletados)
+                salvar_etapa("validacao_qualidade", validacao_qualidade, categoria="analise_completa")
+                
+                # 3. Determina tipo de relatório baseado na qualidade
+                if not validacao_qualidade['qualidade_suficiente']:
+                    logger.warning("⚠️ Qualidade insuficiente - gerando relatório mínimo")
+                    relatorio_final = self._gerar_relatorio_minimo(dados_coletados, session_id, validacao_qualidade, now_iso)
+                else:
+                    logger.info("✅ Qualidade suficiente - gerando relatório completo")
+                    relatorio_final = self._gerar_relatorio_completo(dados_coletados, session_id, validacao_qualidade, now_iso)
             
             # 4. Adiciona metadados de consolidação
             relatorio_final['metadata_consolidacao'] = {
                 'session_id': session_id,
-                'timestamp_consolidacao': datetime.now().isoformat(),
+                'timestamp_consolidacao': now_iso,
                 'qualidade_dados': validacao_qualidade,
                 'tipo_relatorio': 'minimo' if (force_minimal or not validacao_qualidade['qualidade_suficiente']) else 'completo',
-                'arquivos_intermediarios': self._listar_arquivos_intermediarios(session_id),
+                'arquivos_intermediarios': arquivos_intermediarios,
                 'garantia_dados': 'Todos os dados intermediários preservados',
                 'acesso_direto': f"relatorios_intermediarios/{session_id}/"
             }
@@ -103,9 +216,14 @@ class ConsolidacaoFinal:
             salvar_erro("consolidacao_final", e, contexto={"session_id": session_id})
             
             # Fallback absoluto - NUNCA falha
-            return self._fallback_absoluto(session_id, str(e))
+            return self._fallback_absoluto(session_id, str(e), now_iso)
     
-    def _coletar_todos_dados(self, dados_pipeline: Dict[str, Any], session_id: str) -> Dict[str, Any]:
+    def _coletar_todos_dados(
+        self, 
+        dados_pipeline: Dict[str, Any], 
+        session_id: str,
+        arquivos_intermediarios: Optional[List[Dict[str, Any]]] = None
+    ) -> Dict[str, Any]:
         """Coleta todos os dados disponíveis"""
         
         dados_coletados = {
@@ -120,19 +238,28 @@ class ConsolidacaoFinal:
             etapas_salvas = auto_save_manager.listar_etapas_salvas(session_id)
             dados_coletados['etapas_salvas'] = etapas_salvas
             
-            # Recupera dados de cada etapa
-            for etapa_nome in etapas_salvas.keys():
-                try:
-                    dados_etapa = auto_save_manager.recuperar_etapa(etapa_nome, session_id)
-                    if dados_etapa and dados_etapa.get('status') == 'sucesso':
-                        dados_coletados[etapa_nome] = dados_etapa.get('dados')
-                        dados_coletados['componentes_disponiveis'].append(etapa_nome)
-                except Exception as e:
-                    logger.warning(f"⚠️ Erro ao recuperar etapa {etapa_nome}: {e}")
-                    continue
-            
-            # Lista arquivos intermediários
-            dados_coletados['arquivos_encontrados'] = self._listar_arquivos_intermediarios(session_id)
+            # Recupera dados de cada etapa em paralelo (leituras de arquivo independentes);
+            # os resultados são consumidos na ordem de etapas_salvas para o relatório não depender do agendamento
+            if etapas_salvas:
+                with ThreadPoolExecutor(max_workers=min(32, len(etapas_salvas))) as executor:
+                    futures = [
+                        (etapa_nome, executor.submit(auto_save_manager.recuperar_etapa, etapa_nome, session_id))
+                        for etapa_nome in etapas_salvas
+                    ]
+                    for etapa_nome, future in futures:
+                        try:
+                            dados_etapa = future.result()
+                            if dados_etapa and dados_etapa.get('status') == 'sucesso':
+                                dados_coletados[etapa_nome] = dados_etapa.get('dados')
+                                dados_coletados['componentes_disponiveis'].append(etapa_nome)
+                        except Exception as e:
+                            logger.warning(f"⚠️ Erro ao recuperar etapa {etapa_nome}: {e}")
+                            continue
+            
+            # Lista arquivos intermediários (se ainda não listados pelo chamador)
+            if arquivos_intermediarios is None:
+                arquivos_intermediarios = self._listar_arquivos_intermediarios(session_id)
+            dados_coletados['arquivos_encontrados'] = arquivos_intermediarios
             
             logger.info(f"📊 Dados coletados: {len(dados_coletados['componentes_disponiveis'])} componentes, {len(dados_coletados['arquivos_encontrados'])} arquivos")
             
@@ -142,6 +269,21 @@ class ConsolidacaoFinal:
         
         return dados_coletados
     
+    def _validacao_modo_minimo(self) -> Dict[str, Any]:
+        """Resultado de validação usado quando o modo mínimo é forçado"""
+        
+        return {
+            'qualidade_suficiente': False,
+            'componentes_encontrados': 0,
+            'drivers_mentais_count': 0,
+            'provas_visuais_count': 0,
+            'pesquisa_fontes': 0,
+            'insights_count': 0,
+            'score_qualidade': 0,
+            'problemas_identificados': ["Modo mínimo forçado - validação de qualidade não executada"],
+            'recomendacoes': []
+        }
+    
     def _validar_qualidade_dados(self, dados_coletados: Dict[str, Any]) -> Dict[str, Any]:
         """Valida qualidade dos dados coletados"""
         
@@ -185,25 +327,13 @@ class ConsolidacaoFinal:
             criterios_atendidos = 0
             total_criterios = len(self.quality_thresholds)
             
-            if validacao['drivers_mentais_count'] >= self.quality_thresholds['min_drivers_mentais']:
-                criterios_atendidos += 1
-            else:
-                validacao['problemas_identificados'].append(f"Drivers mentais insuficientes: {validacao['drivers_mentais_count']} < {self.quality_thresholds['min_drivers_mentais']}")
-            
-            if validacao['provas_visuais_count'] >= self.quality_thresholds['min_provas_visuais']:
-                criterios_atendidos += 1
-            else:
-                validacao['problemas_identificados'].append(f"Provas visuais insuficientes: {validacao['provas_visuais_count']} < {self.quality_thresholds['min_provas_visuais']}")
-            
-            if validacao['pesquisa_fontes'] >= self.quality_thresholds['min_fontes_pesquisa']:
-                criterios_atendidos += 1
-            else:
-                validacao['problemas_identificados'].append(f"Fontes de pesquisa insuficientes: {validacao['pesquisa_fontes']} < {self.quality_thresholds['min_fontes_pesquisa']}")
-            
-            if validacao['insights_count'] >= self.quality_thresholds['min_insights']:
-                criterios_atendidos += 1
-            else:
-                validacao['problemas_identificados'].append(f"Insights insuficientes: {validacao['insights_count']} < {self.quality_thresholds['min_insights']}")
+            for chave, chave_limite, rotulo in self._CRITERIOS_QUALIDADE:
+                valor = validacao[chave]
+                limite = self.quality_thresholds[chave_limite]
+                if valor >= limite:
+                    criterios_atendidos += 1
+                else:
+                    validacao['problemas_identificados'].append(f"{rotulo} insuficientes: {valor} < {limite}")
             
             # Qualidade suficiente se atende pelo menos 60% dos critérios
             validacao['qualidade_suficiente'] = (criterios_atendidos / total_criterios) >= 0.6
@@ -228,7 +358,8 @@ class ConsolidacaoFinal:
         self, 
         dados_coletados: Dict[str, Any], 
         session_id: str, 
-        validacao: Dict[str, Any]
+        validacao: Dict[str, Any],
+        now_iso: str
     ) -> Dict[str, Any]:
         """Gera relatório completo com todos os componentes"""
         
@@ -236,24 +367,20 @@ class ConsolidacaoFinal:
             relatorio = {
                 'tipo': 'relatorio_completo',
                 'session_id': session_id,
-                'timestamp': datetime.now().isoformat(),
+                'timestamp': now_iso,
                 'qualidade_validada': True,
                 'score_qualidade': validacao['score_qualidade']
             }
             
             # Adiciona todos os componentes disponíveis
-            componentes_principais = [
-                'projeto_dados', 'pesquisa_web_massiva', 'avatar_ultra_detalhado',
-                'drivers_mentais_customizados', 'provas_visuais_sugeridas',
-                'sistema_anti_objecao', 'pre_pitch_invisivel', 'predicoes_futuro_completas',
-                'insights_exclusivos'
-            ]
-            
-            for componente in componentes_principais:
-                if componente in dados_coletados:
-                    relatorio[componente] = dados_coletados[componente]
-                elif componente in dados_coletados.get('dados_pipeline', {}):
-                    relatorio[componente] = dados_coletados['dados_pipeline'][componente]
+            # Apenas referências aos dados coletados (sem cópia dos componentes)
+            pipeline = dados_coletados.get('dados_pipeline') or {}
+            for componente in self._COMPONENTES_PRINCIPAIS:
+                valor = dados_coletados.get(componente)
+                if valor is None:
+                    valor = pipeline.get(componente)
+                if valor is not None:
+                    relatorio[componente] = valor
             
             # Adiciona resumo executivo
             relatorio['resumo_executivo'] = self._gerar_resumo_executivo(dados_coletados, validacao)
@@ -266,13 +393,14 @@ class ConsolidacaoFinal:
         except Exception as e:
             logger.error(f"❌ Erro ao gerar relatório completo: {e}")
             salvar_erro("relatorio_completo", e)
-            return self._gerar_relatorio_minimo(dados_coletados, session_id, validacao)
+            return self._gerar_relatorio_minimo(dados_coletados, session_id, validacao, now_iso)
     
     def _gerar_relatorio_minimo(
         self, 
         dados_coletados: Dict[str, Any], 
         session_id: str, 
-        validacao: Dict[str, Any]
+        validacao: Dict[str, Any],
+        now_iso: str
     ) -> Dict[str, Any]:
         """Gera relatório mínimo garantido"""
         
@@ -280,7 +408,7 @@ class ConsolidacaoFinal:
             relatorio = {
                 'tipo': 'relatorio_minimo',
                 'session_id': session_id,
-                'timestamp': datetime.now().isoformat(),
+                'timestamp': now_iso,
                 'status': 'parcial_mas_preservado',
                 'qualidade_limitada': True,
                 'score_qualidade': validacao.get('score_qualidade', 0)
@@ -304,12 +432,11 @@ class ConsolidacaoFinal:
             }
             
             # Adiciona o que foi possível recuperar
-            componentes_recuperados = {}
-            for componente in dados_coletados['componentes_disponiveis']:
-                if componente in dados_coletados:
-                    componentes_recuperados[componente] = dados_coletados[componente]
-            
-            relatorio['dados_recuperados'] = componentes_recuperados
+            # (componentes_disponiveis só contém chaves presentes em dados_coletados)
+            relatorio['dados_recuperados'] = {
+                componente: dados_coletados[componente]
+                for componente in dados_coletados['componentes_disponiveis']
+            }
             
             # Adiciona diagnóstico dos problemas
             relatorio['diagnostico_problemas'] = {
@@ -337,7 +464,25 @@ class ConsolidacaoFinal:
         except Exception as e:
             logger.error(f"❌ Erro crítico ao gerar relatório mínimo: {e}")
             salvar_erro("relatorio_minimo", e)
-            return self._fallback_absoluto(session_id, str(e))
+            return self._fallback_absoluto(session_id, str(e), now_iso)
+    
+    def _gerar_relatorio_minimo_rapido(
+        self, 
+        dados_pipeline: Dict[str, Any], 
+        session_id: str, 
+        validacao: Dict[str, Any],
+        now_iso: str,
+        arquivos_intermediarios: List[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """Gera relatório mínimo direto dos dados do pipeline, sem recuperar etapas salvas"""
+        
+        dados_coletados = {
+            'dados_pipeline': dados_pipeline,
+            'etapas_salvas': {},
+            'arquivos_encontrados': arquivos_intermediarios,
+            'componentes_disponiveis': []
+        }
+        return self._gerar_relatorio_minimo(dados_coletados, session_id, validacao, now_iso)
     
     def _gerar_resumo_executivo(self, dados_coletados: Dict[str, Any], validacao: Dict[str, Any]) -> Dict[str, Any]:
         """Gera resumo executivo da análise"""
@@ -402,15 +547,12 @@ class ConsolidacaoFinal:
             }
             
             # Identifica componentes que falharam
-            componentes_esperados = [
-                'pesquisa_web_massiva', 'avatar_ultra_detalhado', 'drivers_mentais_customizados',
-                'provas_visuais_sugeridas', 'sistema_anti_objecao', 'pre_pitch_invisivel'
+            disponiveis = set(dados_coletados['componentes_disponiveis'])
+            diagnostico['componentes_falharam'] = [
+                componente for componente in self._COMPONENTES_ESPERADOS
+                if componente not in disponiveis
             ]
             
-            for componente in componentes_esperados:
-                if componente not in dados_coletados['componentes_disponiveis']:
-                    diagnostico['componentes_falharam'].append(componente)
-            
             # Avaliação final
             if validacao['qualidade_suficiente']:
                 diagnostico['avaliacao'] = "Análise bem-sucedida com qualidade adequada"
@@ -433,21 +575,23 @@ class ConsolidacaoFinal:
         """Lista todos os arquivos intermediários salvos"""
         
         arquivos = []
-        base_dir = Path("relatorios_intermediarios")
+        base_dir = "relatorios_intermediarios"
         
         try:
             # Busca em todos os subdiretórios
-            for subdir in base_dir.iterdir():
-                if subdir.is_dir():
-                    for arquivo in subdir.rglob("*"):
-                        if arquivo.is_file() and session_id in arquivo.name:
-                            arquivos.append({
-                                'nome': arquivo.name,
-                                'caminho': str(arquivo),
-                                'tamanho': arquivo.stat().st_size,
-                                'categoria': subdir.name,
-                                'modificado': datetime.fromtimestamp(arquivo.stat().st_mtime).isoformat()
-                            })
+            with os.scandir(base_dir) as entradas:
+                subdirs = [entrada for entrada in entradas if entrada.is_dir()]
+            
+            for subdir in subdirs:
+                for arquivo in _varrer_arquivos_sessao(subdir.path, session_id):
+                    st = arquivo.stat()
+                    arquivos.append({
+                        'nome': arquivo.name,
+                        'caminho': arquivo.path,
+                        'tamanho': st.st_size,
+                        'categoria': subdir.name,
+                        'modificado': datetime.fromtimestamp(st.st_mtime).isoformat()
+                    })
         
         except Exception as e:
             logger.error(f"❌ Erro ao listar arquivos intermediários: {e}")
@@ -458,25 +602,38 @@ class ConsolidacaoFinal:
         """Gera relatório em múltiplos formatos"""
         
         formatos_gerados = {}
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        pendentes = []
         
-        for formato, gerador in self.template_engines.items():
+        for formato in self._FORMATOS:
             try:
-                conteudo = gerador(relatorio, session_id)
+                conteudo = getattr(self, f'_generate_{formato}_report')(relatorio, session_id)
                 if conteudo:
-                    # Salva arquivo do formato
-                    arquivo_path = self._salvar_formato(conteudo, formato, session_id)
-                    formatos_gerados[formato] = arquivo_path
-                    logger.info(f"✅ Formato {formato} gerado: {arquivo_path}")
+                    pendentes.append((conteudo, formato))
             except Exception as e:
                 logger.error(f"❌ Erro ao gerar formato {formato}: {e}")
                 continue
         
+        # Salva os arquivos dos formatos em paralelo
+        if pendentes:
+            with ThreadPoolExecutor(max_workers=len(pendentes)) as executor:
+                caminhos = executor.map(
+                    lambda pendente: self._salvar_formato(pendente[0], pendente[1], session_id, timestamp),
+                    pendentes
+                )
+                for (_, formato), arquivo_path in zip(pendentes, caminhos):
+                    # Falha na escrita (inclusive erro de formatação de um gerador em blocos): formato omitido
+                    if arquivo_path is None:
+                        continue
+                    formatos_gerados[formato] = arquivo_path
+                    logger.info(f"✅ Formato {formato} gerado: {arquivo_path}")
+        
         return formatos_gerados
     
-    def _generate_markdown_report(self, relatorio: Dict[str, Any], session_id: str) -> str:
-        """Gera relatório em Markdown"""
+    def _generate_markdown_report(self, relatorio: Dict[str, Any], session_id: str) -> Iterator[str]:
+        """Gera relatório em Markdown, em blocos para escrita direta no arquivo"""
         
-        md_content = f"""# Relatório de Análise Ultra-Detalhada
+        yield f"""# Relatório de Análise Ultra-Detalhada
 ## ARQV30 Enhanced v2.0
 
 **Sessão:** {session_id}  
@@ -489,105 +646,92 @@ class ConsolidacaoFinal:
         
         if 'resumo_executivo' in relatorio:
             resumo = relatorio['resumo_executivo']
-            md_content += f"**Segmento:** {resumo.get('segmento_analisado', 'N/A')}  \n"
-            md_content += f"**Produto/Serviço:** {resumo.get('produto_servico', 'N/A')}  \n"
-            md_content += f"**Qualidade:** {resumo.get('qualidade_analise', 0):.1f}%  \n"
-            md_content += f"**Componentes:** {resumo.get('componentes_gerados', 0)}  \n\n"
+            yield f"**Segmento:** {resumo.get('segmento_analisado', 'N/A')}  \n"
+            yield f"**Produto/Serviço:** {resumo.get('produto_servico', 'N/A')}  \n"
+            yield f"**Qualidade:** {resumo.get('qualidade_analise', 0):.1f}%  \n"
+            yield f"**Componentes:** {resumo.get('componentes_gerados', 0)}  \n\n"
         
         # Adiciona seções principais
         if 'drivers_mentais_customizados' in relatorio:
-            md_content += "### 🧠 Drivers Mentais Customizados\n\n"
+            yield "### 🧠 Drivers Mentais Customizados\n\n"
             drivers = relatorio['drivers_mentais_customizados']
             if isinstance(drivers, dict) and 'drivers_customizados' in drivers:
                 for i, driver in enumerate(drivers['drivers_customizados'], 1):
-                    md_content += f"#### Driver {i}: {driver.get('nome', 'N/A')}\n"
-                    md_content += f"**Gatilho:** {driver.get('gatilho_central', 'N/A')}  \n"
-                    md_content += f"**História:** {driver.get('roteiro_ativacao', {}).get('historia_analogia', 'N/A')}  \n\n"
+                    yield f"#### Driver {i}: {driver.get('nome', 'N/A')}\n"
+                    yield f"**Gatilho:** {driver.get('gatilho_central', 'N/A')}  \n"
+                    yield f"**História:** {_dig(driver, 'roteiro_ativacao', 'historia_analogia', default='N/A')}  \n\n"
         
         if 'insights_exclusivos' in relatorio:
-            md_content += "### 💡 Insights Exclusivos\n\n"
+            yield "### 💡 Insights Exclusivos\n\n"
             insights = relatorio['insights_exclusivos']
             if isinstance(insights, list):
                 for i, insight in enumerate(insights, 1):
-                    md_content += f"{i}. {insight}\n"
-            md_content += "\n"
+                    yield f"{i}. {insight}\n"
+            yield "\n"
         
         # Adiciona diagnóstico
         if 'diagnostico_final' in relatorio:
             diagnostico = relatorio['diagnostico_final']
-            md_content += "### 🎯 Diagnóstico Final\n\n"
-            md_content += f"**Status:** {diagnostico.get('status_geral', 'N/A')}  \n"
-            md_content += f"**Avaliação:** {diagnostico.get('avaliacao', 'N/A')}  \n"
-            md_content += f"**Recomendação:** {diagnostico.get('recomendacao', 'N/A')}  \n\n"
-        
-        return md_content
+            yield "### 🎯 Diagnóstico Final\n\n"
+            yield f"**Status:** {diagnostico.get('status_geral', 'N/A')}  \n"
+            yield f"**Avaliação:** {diagnostico.get('avaliacao', 'N/A')}  \n"
+            yield f"**Recomendação:** {diagnostico.get('recomendacao', 'N/A')}  \n\n"
     
     def _generate_html_report(self, relatorio: Dict[str, Any], session_id: str) -> str:
         """Gera relatório em HTML"""
         
-        html_content = f"""<!DOCTYPE html>
-<html lang="pt-BR">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Relatório ARQV30 - {session_id}</title>
-    <style>
-        body {{ font-family: Arial, sans-serif; margin: 40px; background: #f5f5f5; }}
-        .container {{ max-width: 1200px; margin: 0 auto; background: white; padding: 40px; border-radius: 10px; box-shadow: 0 4px 6px rgba(0,0,0,0.1); }}
-        h1 {{ color: #2c3e50; border-bottom: 3px solid #3498db; padding-bottom: 10px; }}
-        h2 {{ color: #34495e; margin-top: 30px; }}
-        .metric {{ background: #ecf0f1; padding: 15px; margin: 10px 0; border-radius: 5px; }}
-        .insight {{ background: #e8f5e8; padding: 10px; margin: 5px 0; border-left: 4px solid #27ae60; }}
-        .warning {{ background: #fdf2e9; padding: 10px; margin: 5px 0; border-left: 4px solid #f39c12; }}
-        .error {{ background: #fadbd8; padding: 10px; margin: 5px 0; border-left: 4px solid #e74c3c; }}
-    </style>
-</head>
-<body>
-    <div class="container">
-        <h1>📊 Relatório de Análise Ultra-Detalhada</h1>
-        <p><strong>Sessão:</strong> {session_id}</p>
-        <p><strong>Data:</strong> {relatorio.get('timestamp', 'N/A')}</p>
-        <p><strong>Tipo:</strong> {relatorio.get('tipo', 'N/A')}</p>
-"""
-        
-        # Adiciona conteúdo baseado nos dados disponíveis
-        if 'resumo_executivo' in relatorio:
-            resumo = relatorio['resumo_executivo']
-            html_content += f"""
-        <h2>📋 Resumo Executivo</h2>
-        <div class="metric">
-            <strong>Segmento:</strong> {resumo.get('segmento_analisado', 'N/A')}<br>
-            <strong>Produto/Serviço:</strong> {resumo.get('produto_servico', 'N/A')}<br>
-            <strong>Qualidade:</strong> {resumo.get('qualidade_analise', 0):.1f}%<br>
-            <strong>Componentes:</strong> {resumo.get('componentes_gerados', 0)}
-        </div>
-"""
-        
-        if 'insights_exclusivos' in relatorio:
-            html_content += "<h2>💡 Insights Exclusivos</h2>"
-            insights = relatorio['insights_exclusivos']
-            if isinstance(insights, list):
-                for insight in insights:
-                    html_content += f'<div class="insight">{insight}</div>'
+        return _HTML_TEMPLATE.format_map({
+            'session_id': session_id,
+            'timestamp': relatorio.get('timestamp', 'N/A'),
+            'tipo': relatorio.get('tipo', 'N/A'),
+            'resumo_block': self._html_resumo_block(relatorio),
+            'insights_block': self._html_insights_block(relatorio)
+        })
+    
+    def _html_resumo_block(self, relatorio: Dict[str, Any]) -> str:
+        """Bloco HTML do resumo executivo"""
+        
+        if 'resumo_executivo' not in relatorio:
+            return ''
+        
+        resumo = relatorio['resumo_executivo']
+        return _HTML_RESUMO_BLOCK.format(
+            segmento=resumo.get('segmento_analisado', 'N/A'),
+            produto=resumo.get('produto_servico', 'N/A'),
+            qualidade=resumo.get('qualidade_analise', 0),
+            componentes=resumo.get('componentes_gerados', 0)
+        )
+    
+    def _html_insights_block(self, relatorio: Dict[str, Any]) -> str:
+        """Bloco HTML dos insights exclusivos"""
         
-        html_content += """
-    </div>
-</body>
-</html>"""
+        if 'insights_exclusivos' not in relatorio:
+            return ''
         
-        return html_content
+        parts = ["<h2>💡 Insights Exclusivos</h2>"]
+        insights = relatorio['insights_exclusivos']
+        if isinstance(insights, list):
+            parts.extend(f'<div class="insight">{insight}</div>' for insight in insights)
+        return ''.join(parts)
     
-    def _generate_json_report(self, relatorio: Dict[str, Any], session_id: str) -> str:
-        """Gera relatório em JSON"""
-        try:
-            return json.dumps(relatorio, ensure_ascii=False, indent=2)
-        except Exception as e:
-            logger.error(f"❌ Erro ao gerar JSON: {e}")
-            return json.dumps({
-                'erro': 'Falha na serialização JSON',
-                'session_id': session_id,
-                'timestamp': datetime.now().isoformat()
-            }, ensure_ascii=False, indent=2)
+    def _generate_json_report(self, relatorio: Dict[str, Any], session_id: str) -> Callable[[TextIO], None]:
+        """Gera relatório em JSON, serializado em streaming direto no arquivo"""
+        
+        def escrever(arquivo: TextIO) -> None:
+            try:
+                # json.dump usa iterencode: escreve em blocos sem montar a string completa
+                json.dump(relatorio, arquivo, ensure_ascii=False, indent=2)
+            except Exception as e:
+                logger.error(f"❌ Erro ao gerar JSON: {e}")
+                arquivo.seek(0)
+                arquivo.truncate()
+                json.dump({
+                    'erro': 'Falha na serialização JSON',
+                    'session_id': session_id,
+                    'timestamp': datetime.now().isoformat()
+                }, arquivo, ensure_ascii=False, indent=2)
+        
+        return escrever
     
     def _generate_minimal_report(self, relatorio: Dict[str, Any], session_id: str) -> str:
         """Gera relatório mínimo em texto"""
@@ -603,14 +747,14 @@ COMPONENTES GERADOS:
 {chr(10).join(f"✅ {comp}" for comp in relatorio.get('componentes_gerados', []))}
 
 ARQUIVOS SALVOS:
-Localização: {relatorio.get('arquivos_intermediarios', {}).get('localizacao', 'N/A')}
-Total: {relatorio.get('arquivos_intermediarios', {}).get('total_arquivos', 0)} arquivos
+Localização: {_dig(relatorio, 'arquivos_intermediarios', 'localizacao', default='N/A')}
+Total: {_dig(relatorio, 'arquivos_intermediarios', 'total_arquivos', default=0)} arquivos
 
 DIAGNÓSTICO:
-{relatorio.get('diagnostico_final', {}).get('avaliacao', 'N/A')}
+{_dig(relatorio, 'diagnostico_final', 'avaliacao', default='N/A')}
 
 RECOMENDAÇÃO:
-{relatorio.get('diagnostico_final', {}).get('recomendacao', 'N/A')}
+{_dig(relatorio, 'diagnostico_final', 'recomendacao', default='N/A')}
 
 GARANTIA:
 ✅ NENHUM DADO FOI PERDIDO
@@ -621,38 +765,48 @@ GARANTIA:
         
         return content
     
-    def _salvar_formato(self, conteudo: str, formato: str, session_id: str) -> str:
-        """Salva conteúdo em arquivo específico"""
+    def _caminho_formato(self, formato: str, session_id: str, timestamp: str) -> Path:
+        """Caminho do arquivo de um formato gerado no instante informado"""
+        
+        extensao = self._EXTENSOES.get(formato, '.txt')
+        filename = f"relatorio_final_{session_id[:8]}_{timestamp}{extensao}"
+        return Path("relatorios_intermediarios/analise_completa") / filename
+    
+    def _salvar_formato(
+        self,
+        conteudo: Union[str, Iterator[str], Callable[[TextIO], None]],
+        formato: str,
+        session_id: str,
+        timestamp: str
+    ) -> Optional[str]:
+        """Salva conteúdo (texto, blocos de texto ou função escritora) em arquivo específico; None se falhar"""
         
+        filepath = self._caminho_formato(formato, session_id, timestamp)
         try:
-            # Define extensão
-            extensoes = {
-                'markdown': '.md',
-                'html': '.html',
-                'json': '.json',
-                'minimal': '.txt'
-            }
-            
-            extensao = extensoes.get(formato, '.txt')
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            filename = f"relatorio_final_{session_id[:8]}_{timestamp}{extensao}"
-            
             # Salva no diretório de análises completas
-            base_dir = Path("relatorios_intermediarios/analise_completa")
-            base_dir.mkdir(parents=True, exist_ok=True)
+            filepath.parent.mkdir(parents=True, exist_ok=True)
             
-            filepath = base_dir / filename
-            
-            with open(filepath, 'w', encoding='utf-8') as f:
-                f.write(conteudo)
+            if isinstance(conteudo, str):
+                _escrever_bytes(str(filepath), conteudo.encode('utf-8'))
+            else:
+                with open(filepath, 'w', encoding='utf-8', buffering=64 * 1024) as f:
+                    if callable(conteudo):
+                        conteudo(f)
+                    else:
+                        f.writelines(conteudo)
             
             return str(filepath)
             
         except Exception as e:
+            # Blocos são gerados durante a escrita: remove o arquivo parcial em vez de deixá-lo truncado
             logger.error(f"❌ Erro ao salvar formato {formato}: {e}")
-            return f"Erro ao salvar: {str(e)}"
+            try:
+                filepath.unlink()
+            except OSError:
+                pass
+            return None
     
-    def _fallback_absoluto(self, session_id: str, erro: str) -> Dict[str, Any]:
+    def _fallback_absoluto(self, session_id: str, erro: str, now_iso: str) -> Dict[str, Any]:
         """Fallback absoluto que NUNCA falha"""
         
         try:
@@ -660,7 +814,7 @@ GARANTIA:
             relatorio_emergencia = {
                 'tipo': 'relatorio_emergencia',
                 'session_id': session_id,
-                'timestamp': datetime.now().isoformat(),
+                'timestamp': now_iso,
                 'status': 'ERRO_MAS_DADOS_PRESERVADOS',
                 'erro_consolidacao': erro,
                 'garantias': {
@@ -679,8 +833,8 @@ GARANTIA:
                 'valor_preservado': 'ALTO - Todos os dados intermediários estão disponíveis'
             }
             
-            # Salva relatório de emergência
-            salvar_etapa("relatorio_emergencia", relatorio_emergencia, categoria="analise_completa")
+            # Salva relatório de emergência pelo caminho mais curto
+            self._gravar_emergencia(relatorio_emergencia, now_iso)
             
             return relatorio_emergencia
             
@@ -691,12 +845,30 @@ GARANTIA:
             return {
                 'tipo': 'emergencia_critica',
                 'session_id': session_id,
-                'timestamp': datetime.now().isoformat(),
+                'timestamp': now_iso,
                 'erro_original': erro,
                 'erro_fallback': str(final_error),
                 'status': 'CRITICO_MAS_SESSAO_PRESERVADA',
                 'instrucao': f"Verifique manualmente: relatorios_intermediarios/{session_id}/"
             }
 
+    def _gravar_emergencia(self, relatorio: Dict[str, Any], now_iso: str) -> str:
+        """Grava o relatório de emergência direto em bytes JSON, sem passar por salvar_etapa"""
+        
+        # Mesmo destino e nome de arquivo de salvar_etapa, para continuar recuperável
+        diretorio = f"{auto_save_manager.base_path}/analise_completa"
+        os.makedirs(diretorio, exist_ok=True)
+        timestamp = datetime.fromisoformat(now_iso).strftime("%Y%m%d_%H%M%S_%f")[:-3]
+        caminho = f"{diretorio}/relatorio_emergencia_{timestamp}.json"
+        
+        if HAS_ORJSON:
+            dados = orjson.dumps(relatorio, default=str, option=orjson.OPT_APPEND_NEWLINE)
+        else:
+            dados = (json.dumps(relatorio, ensure_ascii=False, default=str) + '\n').encode('utf-8')
+        
+        _escrever_bytes(caminho, dados)
+        logger.info(f"💾 Relatório de emergência salvo: {caminho}")
+        return caminho
+
 # Instância global
 consolidacao_final = ConsolidacaoFinal()
\ No newline at end of file
@@ -6,11 +6,25 @@ Cliente stub para Exa (não implementado)
 """
 
 import logging
+from datetime import datetime
+from typing import Any, Dict, List, TypedDict
 
 logger = logging.getLogger(__name__)
 
+class ExaSearchResponse(TypedDict, total=False):
+    """Formato único de resposta da busca Exa (sempre com `results`, mesmo vazio)"""
+    success: bool
+    query: str
+    total_results: int
+    results: List[Dict[str, Any]]
+    search_strategy: str
+    timestamp: str
+    error: str
+
 class ExaClient:
     """Cliente stub para Exa"""
+
+    __slots__ = ('enabled',)
     
     def __init__(self):
         self.enabled = False
@@ -20,8 +34,16 @@ class ExaClient:
         """Verifica se o cliente está disponível"""
         return False
     
-    def search(self, query):
-        return {"success": False, "error": "Exa não implementado"}
+    def search(self, query: str, **kwargs) -> ExaSearchResponse:
+        return {
+            "success": False,
+            "query": query,
+            "total_results": 0,
+            "results": [],
+            "search_strategy": "comprehensive_neural",
+            "timestamp": datetime.now().isoformat(),
+            "error": "Exa não implementado"
+        }
 
 # Instância global
 exa_client = ExaClient()
@@ -152,16 +152,16 @@ class MassiveSocialSearchEngine:
         for post in playwright_results.get('instagram_posts', []):
             social_post = SocialPost(
                 platform='instagram',
-                post_id=f"ig_{hash(post.get('image_url', ''))}",
+                post_id=f"ig_{hash(post.image_url)}",
                 author='unknown',
-                content=post.get('description', ''),
-                likes=post.get('engagement_score', 0),
+                content=post.description,
+                likes=0,
                 comments=0,
                 shares=0,
                 views=0,
-                engagement_rate=post.get('engagement_score', 0) / 100,
-                post_url=post.get('post_url', ''),
-                image_urls=[post.get('image_url', '')],
+                engagement_rate=0.0,
+                post_url=post.post_url,
+                image_urls=[post.image_url],
                 video_url=None,
                 hashtags=[],
                 mentions=[],
@@ -173,16 +173,16 @@ class MassiveSocialSearchEngine:
         for post in playwright_results.get('facebook_posts', []):
             social_post = SocialPost(
                 platform='facebook',
-                post_id=f"fb_{hash(post.get('image_url', ''))}",
+                post_id=f"fb_{hash(post.image_url)}",
                 author='unknown',
-                content=post.get('description', ''),
-                likes=post.get('engagement_score', 0),
+                content=post.description,
+                likes=0,
                 comments=0,
                 shares=0,
                 views=0,
-                engagement_rate=post.get('engagement_score', 0) / 100,
-                post_url=post.get('post_url', ''),
-                image_urls=[post.get('image_url', '')],
+                engagement_rate=0.0,
+                post_url=post.post_url,
+                image_urls=[post.image_url],
                 video_url=None,
                 hashtags=[],
                 mentions=[],
@@ -194,28 +194,26 @@ class MassiveSocialSearchEngine:
         for video in playwright_results.get('youtube_videos', []):
             social_post = SocialPost(
                 platform='youtube',
-                post_id=f"yt_{hash(video.get('image_url', ''))}",
+                post_id=f"yt_{hash(video.image_url)}",
                 author='unknown',
-                content=video.get('title', ''),
+                content=video.title,
                 likes=0,
                 comments=0,
                 shares=0,
-                views=video.get('views_estimate', 0),
-                engagement_rate=video.get('views_estimate', 0) / 1000,
-                post_url=video.get('video_url', ''),
-                image_urls=[video.get('image_url', '')],
-                video_url=video.get('video_url', ''),
+                views=0,
+                engagement_rate=0.0,
+                post_url=video.video_url,
+                image_urls=[video.image_url],
+                video_url=video.video_url,
                 hashtags=[],
                 mentions=[],
                 timestamp=datetime.now()
             )
             all_posts.append(social_post)
         
-        # Filtrar por engajamento mínimo
-        filtered_posts = [p for p in all_posts if (p.likes + p.comments + p.shares + p.views) >= min_engagement]
-        
-        # Ordenar por engajamento
-        filtered_posts.sort(key=lambda x: x.engagement_rate, reverse=True)
+        # O Playwright não lê métricas da página (likes/views ficam em 0): min_engagement não se aplica
+        # a esses posts, que seguem na ordem da extração
+        filtered_posts = all_posts
         
         search_results = SearchResults(
             query=query,
@@ -10,16 +10,174 @@ import logging
 import os
 import json
 import base64
+import hashlib
+import time
+import tempfile
+from dataclasses import dataclass, fields
+from functools import lru_cache
 from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime
 from playwright.async_api import async_playwright, Browser, Page, BrowserContext
 import re
-from urllib.parse import urlparse, urljoin
+from urllib.parse import urlparse, urljoin, quote, quote_plus
+
+try:
+    import aiohttp
+    HAS_AIOHTTP = True
+except ImportError:
+    HAS_AIOHTTP = False
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
 
 logger = logging.getLogger(__name__)
 
+_USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+
+# Hashtag do Instagram: remove espaços e '#' numa única chamada em C
+_TAG_STRIP = str.maketrans('', '', ' #')
+
+# Estado inicial que o YouTube embute no HTML da busca (dispensa renderizar a página)
+_YT_INITIAL_DATA_RE = re.compile(r'var ytInitialData\s*=\s*(\{.*?\});\s*</script>', re.DOTALL)
+
+# Hosts das plataformas e CDNs: DNS + TCP/TLS aquecidos uma vez por contexto, não a cada termo
+_PRECONNECT_HOSTS = (
+    'www.instagram.com', 'scontent.cdninstagram.com', 'www.facebook.com', 'static.xx.fbcdn.net',
+    'www.youtube.com', 'i.ytimg.com', 'www.tiktok.com'
+)
+_PRECONNECT_HTML = ''.join(
+    f'<link rel="dns-prefetch" href="//{host}"><link rel="preconnect" href="https://{host}" crossorigin>'
+    for host in _PRECONNECT_HOSTS
+)
+
+# Recursos que os extratores descartam (só leem atributos do DOM, como <img src>)
+_BLOCKED_RESOURCE_TYPES = frozenset({'media', 'font', 'stylesheet', 'image', 'websocket', 'other'})
+
+async def _block_heavy_resources(route):
+    """Aborta downloads pesados; documento, scripts e XHR/fetch seguem normalmente"""
+    if route.request.resource_type in _BLOCKED_RESOURCE_TYPES:
+        await route.abort()
+    else:
+        await route.continue_()
+
+@dataclass(slots=True)
+class ExtractedItem:
+    """Item extraído de uma plataforma (slots: bem menor que um dict por item); vira dict só ao serializar"""
+    platform: str
+    image_url: str
+    description: str = ''
+    post_url: str = ''
+    title: str = ''
+    video_url: str = ''
+
+_ITEM_FIELDS = tuple(field.name for field in fields(ExtractedItem))
+
+def _item_to_dict(item: ExtractedItem) -> Dict[str, str]:
+    """Formato serializado do item: só os campos preenchidos (os vazios não vão para o JSON)"""
+    return {name: value for name in _ITEM_FIELDS if (value := getattr(item, name))}
+
+# Um único extrator no browser, parametrizado por plataforma; devolve só src/alt/href (payload CDP mínimo)
+_EXTRACT_JS = """
+(cfg) => {
+    const good = cfg.good ? new RegExp(cfg.good) : null;
+    const bad = cfg.bad ? new RegExp(cfg.bad) : null;
+    const out = [];
+    for (const el of Array.prototype.slice.call(document.querySelectorAll(cfg.sel), 0, cfg.limit)) {
+        const src = el.tagName === 'VIDEO' ? (el.poster || el.src) : (el.src || el.getAttribute('data-src'));
+        if (!src || (good && !good.test(src)) || (bad && bad.test(src))) continue;
+        const link = el.closest('a');
+        out.push({src: src, alt: el.alt || '', href: link ? link.getAttribute('href') : null});
+    }
+    return out;
+}
+"""
+
+# Por plataforma: seletor dos elementos (também usado na espera) e regex que o src deve/não pode conter
+# (compiladas uma vez por chamada no browser, em vez de encadear includes() por imagem)
+_EXTRACTION_SPECS = {
+    'instagram': {'sel': 'article img', 'good': 'instagram', 'bad': ''},
+    'facebook': {'sel': 'img[src*="facebook"], img[src*="fbcdn"]', 'good': '', 'bad': 'profile|avatar'},
+    'youtube': {'sel': 'img[src*="ytimg"], img[src*="youtube"]', 'good': 'ytimg', 'bad': 'avatar'},
+    'tiktok': {'sel': 'img[src*="tiktok"], video', 'good': '', 'bad': ''}
+}
+
+# Monta o item final de cada plataforma a partir do bruto (src/alt/href) e da URL da página
+_ITEM_BUILDERS = {
+    'instagram': lambda raw, page_url: ExtractedItem(
+        platform='instagram',
+        image_url=raw['src'],
+        description=raw['alt'],
+        post_url=urljoin(page_url, raw['href']) if raw['href'] else ''
+    ),
+    'facebook': lambda raw, page_url: ExtractedItem(
+        platform='facebook',
+        image_url=raw['src'],
+        description=raw['alt'],
+        post_url=page_url
+    ),
+    'youtube': lambda raw, page_url: ExtractedItem(
+        platform='youtube',
+        image_url=raw['src'],
+        title=raw['alt'],
+        video_url=f"https://youtube.com{raw['href']}" if raw['href'] else ''
+    ),
+    'tiktok': lambda raw, page_url: ExtractedItem(
+        platform='tiktok',
+        image_url=raw['src'],
+        description=raw['alt'] or 'TikTok viral content'
+    )
+}
+
+# Listas do resultado, na ordem das plataformas em _extract_term
+_RESULT_KEYS = ('instagram_posts', 'facebook_posts', 'youtube_videos', 'tiktok_content')
+
+# Perfis persistentes abertos por este processo: o Chromium trava o user_data_dir,
+# então uma segunda extração simultânea usa contexto efêmero em vez de falhar
+_PROFILES_IN_USE = set()
+
+def _write_json_file(filepath: str, content: Dict[str, Any]):
+    """Grava JSON compacto (bloqueante; chamar via asyncio.to_thread)"""
+    # Sem indentação o arquivo tem metade do tamanho; o orjson serializa em C
+    # (ExtractedItem vira dict só com os campos preenchidos, nos dois caminhos)
+    if HAS_ORJSON:
+        with open(filepath, 'wb') as f:
+            f.write(orjson.dumps(
+                content, default=_item_to_dict,
+                option=orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATACLASS
+            ))
+    else:
+        with open(filepath, 'w', encoding='utf-8') as f:
+            json.dump(content, f, ensure_ascii=False, separators=(',', ':'), default=_item_to_dict)
+
+def _iter_dicts_com_chave(dados: Any, chave: str):
+    """Percorre (sem recursão) uma estrutura JSON e devolve os dicts que contêm `chave`"""
+    pilha = [dados]
+    while pilha:
+        atual = pilha.pop()
+        if isinstance(atual, dict):
+            if chave in atual:
+                yield atual
+            pilha.extend(reversed(list(atual.values())))
+        elif isinstance(atual, list):
+            pilha.extend(reversed(atual))
+
 class PlaywrightSocialExtractor:
     """Extrator de conteúdo viral usando Playwright"""
+
+    PLATFORMS = ('instagram', 'facebook', 'youtube', 'tiktok')
+
+    # Back-off por host após HTTP 429 (segundos): começa curto, dobra a cada novo 429, zera no sucesso
+    _BACKOFF_INITIAL = 0.5
+    _BACKOFF_MAX = 30.0
+
+    # Navegações por página antes de recriá-la (a página acumula memória com o uso)
+    _PAGE_RECYCLE_EVERY = 20
+
+    # Navegações totais antes de recriar o contexto (o Chromium só libera a memória ao fechá-lo)
+    _CONTEXT_RECYCLE_EVERY = 50
     
     def __init__(self):
         self.browser: Optional[Browser] = None
@@ -27,11 +185,37 @@ class PlaywrightSocialExtractor:
         self.playwright = None
         self.headless = os.getenv('PLAYWRIGHT_HEADLESS', 'True').lower() == 'true'
         self.timeout = int(os.getenv('PLAYWRIGHT_TIMEOUT', '30000'))
+        # Espera máxima pelo conteúdo após a navegação (a pausa fixa antiga era de 3s)
+        self.selector_timeout = int(os.getenv('PLAYWRIGHT_SELECTOR_TIMEOUT', '3000'))
+
+        # Pool de páginas de vida longa compartilhado por todos os pares (termo, plataforma):
+        # limita a concorrência e reaproveita o cache de JS/CSS do contexto entre termos
+        self.page_pool_size = int(os.getenv('PLAYWRIGHT_PAGE_POOL', '8'))
+        self._page_pool: Optional[asyncio.Queue] = None
+        self._page_navs: Dict[Page, int] = {}
+        self._nav_count = 0
+        self._recycle_lock = asyncio.Lock()
         
         # Configurações de extração
         self.instagram_limit = int(os.getenv('INSTAGRAM_IMAGES_LIMIT', '8'))
         self.facebook_limit = int(os.getenv('FACEBOOK_IMAGES_LIMIT', '6'))
         self.youtube_limit = int(os.getenv('YOUTUBE_THUMBNAILS_LIMIT', '6'))
+        self.tiktok_limit = int(os.getenv('TIKTOK_CONTENT_LIMIT', '6'))
+
+        # Busca direta via HTTP (sem renderizar) + cache em disco por (plataforma, termo)
+        self._http = None
+        self.cache_dir = os.path.join(os.getenv('DATA_DIR', 'analyses_data'), 'social_cache')
+        self.cache_ttl = int(os.getenv('SOCIAL_CACHE_TTL', '21600'))
+        self._backoff: Dict[str, float] = {}
+
+        # Perfil persistente: cache HTTP (JS, CSS, fontes) e cookies sobrevivem entre execuções.
+        # O Chromium trava o diretório: só uma extração por vez usa o perfil, as simultâneas abrem
+        # contexto efêmero (ver _open_context)
+        self.profile_dir = os.path.abspath(os.getenv(
+            'PLAYWRIGHT_PROFILE_DIR', os.path.join(os.getenv('DATA_DIR', 'analyses_data'), '.pw_profile')
+        ))
+        self._profile_claimed = False
+        self._browser_args: List[str] = []
         
         logger.info("🎭 Playwright Social Extractor inicializado")
 
@@ -50,7 +234,7 @@ class PlaywrightSocialExtractor:
             self.playwright = await async_playwright().start()
             
             # Configurações do browser
-            browser_args = [
+            self._browser_args = [
                 '--no-sandbox',
                 '--disable-setuid-sandbox',
                 '--disable-dev-shm-usage',
@@ -63,17 +247,15 @@ class PlaywrightSocialExtractor:
                 '--disable-renderer-backgrounding'
             ]
             
-            self.browser = await self.playwright.chromium.launch(
-                headless=self.headless,
-                args=browser_args
-            )
-            
-            # Criar contexto com user agent realista
-            self.context = await self.browser.new_context(
-                user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-                viewport={'width': 1920, 'height': 1080},
-                locale='pt-BR'
-            )
+            await self._open_context()
+
+            if HAS_AIOHTTP:
+                # Conexões e DNS (TTL de 5 min) compartilhados por todas as buscas diretas
+                self._http = aiohttp.ClientSession(
+                    connector=aiohttp.TCPConnector(limit=50, ttl_dns_cache=300, use_dns_cache=True),
+                    headers={'User-Agent': _USER_AGENT, 'Accept-Language': 'pt-BR,pt;q=0.9'},
+                    timeout=aiohttp.ClientTimeout(total=self.timeout / 1000)
+                )
             
             logger.info("✅ Browser Playwright iniciado com sucesso")
             
@@ -81,9 +263,89 @@ class PlaywrightSocialExtractor:
             logger.error(f"❌ Erro ao iniciar browser: {e}")
             raise
 
+    def _claim_profile(self) -> bool:
+        """Reserva o perfil persistente para esta instância; False se outra extração do processo o usa"""
+        if self._profile_claimed:
+            return True
+        if self.profile_dir in _PROFILES_IN_USE:
+            return False
+        _PROFILES_IN_USE.add(self.profile_dir)
+        self._profile_claimed = True
+        return True
+
+    def _release_profile(self):
+        """Libera o perfil persistente para outras instâncias"""
+        if self._profile_claimed:
+            _PROFILES_IN_USE.discard(self.profile_dir)
+            self._profile_claimed = False
+
+    async def _open_context(self):
+        """Abre o contexto (persistente se o perfil estiver livre, senão efêmero) e o pool de páginas"""
+        context_options = {
+            'user_agent': _USER_AGENT,
+            'viewport': {'width': 1920, 'height': 1080},
+            'locale': 'pt-BR'
+        }
+        self.context = None
+        if self._claim_profile():
+            try:
+                self.context = await self.playwright.chromium.launch_persistent_context(
+                    user_data_dir=self.profile_dir,
+                    headless=self.headless,
+                    args=self._browser_args,
+                    **context_options
+                )
+            except Exception as e:
+                # Perfil travado por outro processo (ex.: outro worker do servidor)
+                logger.warning(f"⚠️ Perfil {self.profile_dir} indisponível, usando contexto efêmero: {e}")
+                self._release_profile()
+        else:
+            logger.info("ℹ️ Perfil persistente em uso por outra extração, usando contexto efêmero")
+
+        if self.context is None:
+            if self.browser is None:
+                self.browser = await self.playwright.chromium.launch(headless=self.headless, args=self._browser_args)
+            self.context = await self.browser.new_context(**context_options)
+        # Na rota do contexto (vale para todas as páginas); o handler é liberado junto com a reciclagem do contexto
+        await self.context.route('**/*', _block_heavy_resources)
+        # O contexto persistente já abre com uma página, que entra no pool (o efêmero abre vazio)
+        pool = asyncio.Queue()
+        pages = list(self.context.pages[:self.page_pool_size])
+        while len(pages) < self.page_pool_size:
+            pages.append(await self.context.new_page())
+        try:
+            await pages[0].set_content(_PRECONNECT_HTML)
+        except Exception as e:
+            logger.debug(f"Preconnect das plataformas falhou: {e}")
+        for page in pages:
+            pool.put_nowait(page)
+        self._page_pool = pool
+        self._page_navs = {}
+        self._nav_count = 0
+
+    async def _recycle_context(self):
+        """Fecha e reabre o contexto após muitas navegações; cookies/storage ficam no perfil em disco"""
+        # Espera todas as páginas voltarem ao pool: nenhuma navegação em curso
+        pages = [await self._page_pool.get() for _ in range(self.page_pool_size)]
+        try:
+            await self.context.close()
+            await self._open_context()
+            logger.info("♻️ Contexto do browser reciclado")
+        except Exception as e:
+            logger.error(f"❌ Erro ao reciclar contexto: {e}")
+            # Devolve as páginas para o pool não travar quem está aguardando
+            self._nav_count = 0
+            for page in pages:
+                self._page_pool.put_nowait(page)
+
     async def close_browser(self):
         """Fecha o browser"""
         try:
+            if self._http:
+                await self._http.close()
+                self._http = None
+            self._page_pool = None
+            self._page_navs = {}
             if self.context:
                 await self.context.close()
             if self.browser:
@@ -93,218 +355,295 @@ class PlaywrightSocialExtractor:
             logger.info("🔒 Browser fechado")
         except Exception as e:
             logger.error(f"❌ Erro ao fechar browser: {e}")
+        finally:
+            self.context = self.browser = self.playwright = None
+            self._release_profile()
+
+    async def _acquire_page(self) -> Page:
+        """Retira uma página do pool (aguarda se todas estiverem em uso); devolver com _release_page"""
+        while True:
+            if self._nav_count >= self._CONTEXT_RECYCLE_EVERY:
+                async with self._recycle_lock:
+                    if self._nav_count >= self._CONTEXT_RECYCLE_EVERY:
+                        await self._recycle_context()
+
+            page = await self._page_pool.get()
+            if self._nav_count < self._CONTEXT_RECYCLE_EVERY:
+                break
+            # Limite atingido enquanto aguardava: devolve a página para a reciclagem poder drenar o pool
+            self._page_pool.put_nowait(page)
+
+        if self._page_navs.get(page, 0) >= self._PAGE_RECYCLE_EVERY:
+            del self._page_navs[page]
+            try:
+                await page.close()
+                page = await self.context.new_page()
+            except Exception:
+                self._page_pool.put_nowait(page)
+                raise
+        self._page_navs[page] = self._page_navs.get(page, 0) + 1
+        self._nav_count += 1
+        return page
+
+    async def _wait_backoff(self, url: str):
+        """Só espera se o host respondeu 429 recentemente"""
+        delay = self._backoff.get(urlparse(url).hostname, 0.0)
+        if delay:
+            await asyncio.sleep(delay)
+
+    def _note_status(self, url: str, status: Optional[int]):
+        """Ajusta o back-off do host conforme o status da última resposta"""
+        host = urlparse(url).hostname
+        if status == 429:
+            self._backoff[host] = min(max(self._backoff.get(host, 0.0) * 2, self._BACKOFF_INITIAL), self._BACKOFF_MAX)
+            logger.warning(f"⚠️ {host} limitou requisições (429); back-off de {self._backoff[host]:.1f}s")
+        elif status is not None and status < 400:
+            self._backoff.pop(host, None)
+
+    async def _goto_and_wait(self, page: Page, url: str, platform: str):
+        """Navega e espera só até o conteúdo da plataforma existir no DOM (sem networkidle nem pausa fixa)"""
+        await self._wait_backoff(url)
+        response = await page.goto(url, wait_until='domcontentloaded', timeout=self.timeout)
+        self._note_status(url, response.status if response else None)
+        try:
+            await page.wait_for_selector(_EXTRACTION_SPECS[platform]['sel'], state='attached', timeout=self.selector_timeout)
+        except Exception as e:
+            # Sem o seletor (ex.: tela de login), extrai o que houver na página
+            logger.debug(f"Seletor de {platform} não apareceu: {e}")
+
+    def _release_page(self, page: Page):
+        """Devolve a página ao pool"""
+        self._page_pool.put_nowait(page)
+
+    def _cache_path(self, platform: str, search_term: str, limit: int) -> str:
+        """Arquivo de cache da combinação plataforma/termo/limite (limite novo não reaproveita lote menor)"""
+        chave = hashlib.blake2b(f"{platform}:{limit}:{search_term.lower()}".encode('utf-8'), digest_size=12).hexdigest()
+        return os.path.join(self.cache_dir, f"{platform}_{chave}.json")
+
+    def _cache_get(self, platform: str, search_term: str, limit: int) -> Optional[List[ExtractedItem]]:
+        """Retorna os itens em cache se ainda dentro do TTL"""
+        path = self._cache_path(platform, search_term, limit)
+        try:
+            if time.time() - os.path.getmtime(path) > self.cache_ttl:
+                return None
+            with open(path, 'r', encoding='utf-8') as f:
+                return [ExtractedItem(**item) for item in json.load(f)]
+        except (OSError, ValueError, TypeError):
+            return None
+
+    def _cache_set(self, platform: str, search_term: str, limit: int, items: List[ExtractedItem]):
+        """Grava os itens extraídos no cache em disco (arquivo temporário + os.replace: leitores nunca veem escrita parcial)"""
+        if not items:
+            return
+        tmp_path = None
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, prefix=f".{platform}_", suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump([_item_to_dict(item) for item in items], f, ensure_ascii=False)
+            os.replace(tmp_path, self._cache_path(platform, search_term, limit))
+        except OSError as e:
+            logger.warning(f"⚠️ Falha ao gravar cache de {platform}: {e}")
+            if tmp_path and os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+
+    def _prune_cache(self):
+        """Remove do cache em disco os arquivos expirados (bloqueante; chamar via asyncio.to_thread)"""
+        limite = time.time() - self.cache_ttl
+        removidos = 0
+        try:
+            with os.scandir(self.cache_dir) as entradas:
+                for entrada in entradas:
+                    try:
+                        if entrada.is_file() and entrada.stat().st_mtime < limite:
+                            os.unlink(entrada.path)
+                            removidos += 1
+                    except OSError:
+                        continue
+        except OSError:
+            return
+        if removidos:
+            logger.info(f"🧹 {removidos} arquivos expirados removidos do cache social")
+
+    async def _fetch_text(self, url: str) -> Optional[str]:
+        """GET simples pela sessão HTTP compartilhada; None se indisponível ou com erro"""
+        if not self._http:
+            return None
+        await self._wait_backoff(url)
+        try:
+            async with self._http.get(url) as response:
+                self._note_status(url, response.status)
+                if response.status != 200:
+                    return None
+                return await response.text()
+        except Exception as e:
+            logger.debug(f"Busca direta falhou para {url}: {e}")
+            return None
+
+    async def _fetch_instagram_direct(self, search_term: str) -> List[ExtractedItem]:
+        """Posts da hashtag pelo endpoint JSON público, sem abrir o navegador"""
+        tag = search_term.translate(_TAG_STRIP)
+        texto = await self._fetch_text(f"https://www.instagram.com/explore/tags/{tag}/?__a=1&__d=dis")
+        if not texto:
+            return []
+        try:
+            dados = json.loads(texto)
+        except ValueError:
+            return []
 
-    async def extract_instagram_posts(self, search_term: str) -> List[Dict[str, Any]]:
-        """Extrai posts virais do Instagram"""
         posts = []
+        for node in _iter_dicts_com_chave(dados, 'display_url'):
+            legenda = _iter_dicts_com_chave(node.get('edge_media_to_caption', {}), 'text')
+            shortcode = node.get('shortcode')
+            posts.append(ExtractedItem(
+                platform='instagram',
+                image_url=node['display_url'],
+                description=next(legenda, {}).get('text', ''),
+                post_url=f"https://www.instagram.com/p/{shortcode}/" if shortcode else ''
+            ))
+            if len(posts) >= self.instagram_limit:
+                break
+        return posts
+
+    async def _fetch_youtube_direct(self, search_term: str) -> List[ExtractedItem]:
+        """Vídeos da busca a partir do ytInitialData embutido no HTML, sem renderizar"""
+        html = await self._fetch_text(f"https://www.youtube.com/results?search_query={quote_plus(search_term)}")
+        match = _YT_INITIAL_DATA_RE.search(html) if html else None
+        if not match:
+            return []
+        try:
+            dados = json.loads(match.group(1))
+        except ValueError:
+            return []
+
+        videos = []
+        for holder in _iter_dicts_com_chave(dados, 'videoRenderer'):
+            renderer = holder['videoRenderer']
+            thumbnails = renderer.get('thumbnail', {}).get('thumbnails') or []
+            video_id = renderer.get('videoId')
+            if not thumbnails or not video_id:
+                continue
+            runs = renderer.get('title', {}).get('runs') or [{}]
+            videos.append(ExtractedItem(
+                platform='youtube',
+                image_url=thumbnails[-1].get('url', ''),
+                title=runs[0].get('text', ''),
+                video_url=f"https://youtube.com/watch?v={video_id}"
+            ))
+            if len(videos) >= self.youtube_limit:
+                break
+        return videos
+
+    async def _extract_with_browser(self, platform: str, url: str, limit: int) -> List[ExtractedItem]:
+        """Navega com uma página do pool e extrai os itens da plataforma com o extrator JS único"""
+        page = await self._acquire_page()
+        try:
+            await self._goto_and_wait(page, url, platform)
+            raw_items = await page.evaluate(_EXTRACT_JS, {**_EXTRACTION_SPECS[platform], 'limit': limit})
+            page_url = page.url
+        finally:
+            self._release_page(page)
+
+        build = _ITEM_BUILDERS[platform]
+        return [build(raw, page_url) for raw in raw_items]
+
+    async def extract_instagram_posts(self, search_term: str) -> List[ExtractedItem]:
+        """Extrai posts virais do Instagram"""
+        cached = self._cache_get('instagram', search_term, self.instagram_limit)
+        if cached is not None:
+            return cached
+
+        posts = await self._fetch_instagram_direct(search_term)
+        if posts:
+            self._cache_set('instagram', search_term, self.instagram_limit, posts)
+            logger.info(f"📸 Instagram (direto): {len(posts)} posts extraídos para '{search_term}'")
+            return posts
         
         try:
-            page = await self.context.new_page()
-            
-            # Navegar para Instagram
-            search_url = f"https://www.instagram.com/explore/tags/{search_term.replace(' ', '').replace('#', '')}"
-            await page.goto(search_url, wait_until='networkidle', timeout=self.timeout)
-            
-            # Aguardar carregamento
-            await page.wait_for_timeout(3000)
-            
-            # Extrair posts
-            posts_data = await page.evaluate("""
-                () => {
-                    const posts = [];
-                    const articles = document.querySelectorAll('article img');
-                    
-                    articles.forEach((img, index) => {
-                        if (index < 8) { // Limite de posts
-                            const src = img.src || img.getAttribute('data-src');
-                            const alt = img.alt || '';
-                            const parent = img.closest('a');
-                            const href = parent ? parent.href : '';
-                            
-                            if (src && src.includes('instagram')) {
-                                posts.push({
-                                    image_url: src,
-                                    description: alt,
-                                    post_url: href,
-                                    platform: 'instagram',
-                                    engagement_score: Math.floor(Math.random() * 1000) + 100
-                                });
-                            }
-                        }
-                    });
-                    
-                    return posts;
-                }
-            """)
-            
-            posts.extend(posts_data)
-            await page.close()
+            search_url = f"https://www.instagram.com/explore/tags/{search_term.translate(_TAG_STRIP)}"
+            posts = await self._extract_with_browser('instagram', search_url, self.instagram_limit)
+            self._cache_set('instagram', search_term, self.instagram_limit, posts)
             
-            logger.info(f"📸 Instagram: {len(posts_data)} posts extraídos para '{search_term}'")
+            logger.info(f"📸 Instagram: {len(posts)} posts extraídos para '{search_term}'")
             
         except Exception as e:
             logger.error(f"❌ Erro ao extrair Instagram: {e}")
             
         return posts
 
-    async def extract_facebook_posts(self, search_term: str) -> List[Dict[str, Any]]:
+    async def extract_facebook_posts(self, search_term: str) -> List[ExtractedItem]:
         """Extrai posts virais do Facebook"""
         posts = []
         
         try:
-            page = await self.context.new_page()
+            # Busca pública de posts
+            search_url = f"https://www.facebook.com/search/posts/?q={quote(search_term)}"
+            posts = await self._extract_with_browser('facebook', search_url, self.facebook_limit)
             
-            # Navegar para Facebook (busca pública)
-            search_url = f"https://www.facebook.com/search/posts/?q={search_term.replace(' ', '%20')}"
-            await page.goto(search_url, wait_until='networkidle', timeout=self.timeout)
-            
-            # Aguardar carregamento
-            await page.wait_for_timeout(5000)
-            
-            # Extrair posts (método alternativo para conteúdo público)
-            posts_data = await page.evaluate("""
-                () => {
-                    const posts = [];
-                    const images = document.querySelectorAll('img[src*="facebook"], img[src*="fbcdn"]');
-                    
-                    images.forEach((img, index) => {
-                        if (index < 6) { // Limite de posts
-                            const src = img.src;
-                            const alt = img.alt || '';
-                            
-                            if (src && !src.includes('profile') && !src.includes('avatar')) {
-                                posts.push({
-                                    image_url: src,
-                                    description: alt,
-                                    post_url: window.location.href,
-                                    platform: 'facebook',
-                                    engagement_score: Math.floor(Math.random() * 800) + 50
-                                });
-                            }
-                        }
-                    });
-                    
-                    return posts;
-                }
-            """)
-            
-            posts.extend(posts_data)
-            await page.close()
-            
-            logger.info(f"👥 Facebook: {len(posts_data)} posts extraídos para '{search_term}'")
+            logger.info(f"👥 Facebook: {len(posts)} posts extraídos para '{search_term}'")
             
         except Exception as e:
             logger.error(f"❌ Erro ao extrair Facebook: {e}")
             
         return posts
 
-    async def extract_youtube_thumbnails(self, search_term: str) -> List[Dict[str, Any]]:
+    async def extract_youtube_thumbnails(self, search_term: str) -> List[ExtractedItem]:
         """Extrai thumbnails virais do YouTube"""
-        videos = []
+        cached = self._cache_get('youtube', search_term, self.youtube_limit)
+        if cached is not None:
+            return cached
+
+        videos = await self._fetch_youtube_direct(search_term)
+        if videos:
+            self._cache_set('youtube', search_term, self.youtube_limit, videos)
+            logger.info(f"🎥 YouTube (direto): {len(videos)} thumbnails extraídos para '{search_term}'")
+            return videos
         
         try:
-            page = await self.context.new_page()
-            
-            # Navegar para YouTube
-            search_url = f"https://www.youtube.com/results?search_query={search_term.replace(' ', '+')}"
-            await page.goto(search_url, wait_until='networkidle', timeout=self.timeout)
+            search_url = f"https://www.youtube.com/results?search_query={quote_plus(search_term)}"
+            videos = await self._extract_with_browser('youtube', search_url, self.youtube_limit)
+            self._cache_set('youtube', search_term, self.youtube_limit, videos)
             
-            # Aguardar carregamento
-            await page.wait_for_timeout(3000)
-            
-            # Extrair thumbnails
-            videos_data = await page.evaluate("""
-                () => {
-                    const videos = [];
-                    const thumbnails = document.querySelectorAll('img[src*="ytimg"], img[src*="youtube"]');
-                    
-                    thumbnails.forEach((img, index) => {
-                        if (index < 6) { // Limite de vídeos
-                            const src = img.src;
-                            const alt = img.alt || '';
-                            const parent = img.closest('a');
-                            const href = parent ? 'https://youtube.com' + parent.getAttribute('href') : '';
-                            
-                            if (src && src.includes('ytimg') && !src.includes('avatar')) {
-                                videos.push({
-                                    image_url: src,
-                                    title: alt,
-                                    video_url: href,
-                                    platform: 'youtube',
-                                    views_estimate: Math.floor(Math.random() * 100000) + 1000
-                                });
-                            }
-                        }
-                    });
-                    
-                    return videos;
-                }
-            """)
-            
-            videos.extend(videos_data)
-            await page.close()
-            
-            logger.info(f"🎥 YouTube: {len(videos_data)} thumbnails extraídos para '{search_term}'")
+            logger.info(f"🎥 YouTube: {len(videos)} thumbnails extraídos para '{search_term}'")
             
         except Exception as e:
             logger.error(f"❌ Erro ao extrair YouTube: {e}")
             
         return videos
 
-    async def extract_tiktok_content(self, search_term: str) -> List[Dict[str, Any]]:
+    async def extract_tiktok_content(self, search_term: str) -> List[ExtractedItem]:
         """Extrai conteúdo viral do TikTok"""
         content = []
         
         try:
-            page = await self.context.new_page()
-            
-            # Navegar para TikTok
-            search_url = f"https://www.tiktok.com/search?q={search_term.replace(' ', '%20')}"
-            await page.goto(search_url, wait_until='networkidle', timeout=self.timeout)
-            
-            # Aguardar carregamento
-            await page.wait_for_timeout(4000)
-            
-            # Extrair conteúdo
-            content_data = await page.evaluate("""
-                () => {
-                    const content = [];
-                    const videos = document.querySelectorAll('img[src*="tiktok"], video');
-                    
-                    videos.forEach((element, index) => {
-                        if (index < 6) { // Limite de conteúdo
-                            let src = '';
-                            if (element.tagName === 'IMG') {
-                                src = element.src;
-                            } else if (element.tagName === 'VIDEO') {
-                                src = element.poster || element.src;
-                            }
-                            
-                            if (src) {
-                                content.push({
-                                    image_url: src,
-                                    description: element.alt || 'TikTok viral content',
-                                    platform: 'tiktok',
-                                    engagement_score: Math.floor(Math.random() * 2000) + 500
-                                });
-                            }
-                        }
-                    });
-                    
-                    return content;
-                }
-            """)
+            search_url = f"https://www.tiktok.com/search?q={quote(search_term)}"
+            content = await self._extract_with_browser('tiktok', search_url, self.tiktok_limit)
             
-            content.extend(content_data)
-            await page.close()
-            
-            logger.info(f"🎵 TikTok: {len(content_data)} conteúdos extraídos para '{search_term}'")
+            logger.info(f"🎵 TikTok: {len(content)} conteúdos extraídos para '{search_term}'")
             
         except Exception as e:
             logger.error(f"❌ Erro ao extrair TikTok: {e}")
             
         return content
 
+    async def _safe_extract(self, extractor, term: str) -> List[ExtractedItem]:
+        """Executa um extrator; falha inesperada é registrada e vira lista vazia"""
+        try:
+            return await extractor(term)
+        except Exception as e:
+            logger.warning(f"⚠️ {extractor.__name__} falhou para '{term}': {type(e).__name__}: {e}")
+            return []
+
+    async def _extract_term(self, term: str) -> List[List[ExtractedItem]]:
+        """Extrai as quatro plataformas de um termo, na ordem de _RESULT_KEYS"""
+        logger.info(f"🔍 Extraindo conteúdo para: '{term}'")
+        return await asyncio.gather(
+            self._safe_extract(self.extract_instagram_posts, term),
+            self._safe_extract(self.extract_facebook_posts, term),
+            self._safe_extract(self.extract_youtube_thumbnails, term),
+            self._safe_extract(self.extract_tiktok_content, term)
+        )
+
     async def massive_social_extraction(self, search_terms: List[str]) -> Dict[str, Any]:
         """Executa extração massiva em todas as redes sociais"""
         
@@ -318,42 +657,29 @@ class PlaywrightSocialExtractor:
             'extraction_summary': {
                 'total_terms': len(search_terms),
                 'extraction_time': datetime.now().isoformat(),
-                'platforms_extracted': ['instagram', 'facebook', 'youtube', 'tiktok']
+                'platforms_extracted': list(self.PLATFORMS)
             }
         }
         
-        for term in search_terms:
-            logger.info(f"🔍 Extraindo conteúdo para: '{term}'")
-            
-            try:
-                # Executar extrações em paralelo para cada termo
-                tasks = [
-                    self.extract_instagram_posts(term),
-                    self.extract_facebook_posts(term),
-                    self.extract_youtube_thumbnails(term),
-                    self.extract_tiktok_content(term)
-                ]
-                
-                results = await asyncio.gather(*tasks, return_exceptions=True)
-                
-                # Processar resultados
-                instagram_posts, facebook_posts, youtube_videos, tiktok_content = results
-                
-                if isinstance(instagram_posts, list):
-                    all_content['instagram_posts'].extend(instagram_posts)
-                if isinstance(facebook_posts, list):
-                    all_content['facebook_posts'].extend(facebook_posts)
-                if isinstance(youtube_videos, list):
-                    all_content['youtube_videos'].extend(youtube_videos)
-                if isinstance(tiktok_content, list):
-                    all_content['tiktok_content'].extend(tiktok_content)
-                
-                # Pequena pausa entre termos
-                await asyncio.sleep(2)
-                
-            except Exception as e:
-                logger.error(f"❌ Erro na extração para '{term}': {e}")
-                continue
+        # Descarta entradas expiradas do cache em disco (fora do event loop)
+        await asyncio.to_thread(self._prune_cache)
+
+        # Todos os pares (termo, plataforma) concorrem pelo pool de páginas, que limita o paralelismo
+        results_by_term = await asyncio.gather(*(self._extract_term(term) for term in search_terms))
+
+        # URLs já vistas por lista (a própria string, já mantida viva pelo item)
+        seen_by_key = {key: set() for key in _RESULT_KEYS}
+
+        for results in results_by_term:
+            for key, items in zip(_RESULT_KEYS, results):
+                # A mesma imagem viral reaparece em vários termos: mantém só a primeira ocorrência
+                seen = seen_by_key[key]
+                unique = all_content[key]
+                for item in items:
+                    if item.image_url in seen:
+                        continue
+                    seen.add(item.image_url)
+                    unique.append(item)
         
         # Estatísticas finais
         total_extracted = (
@@ -389,8 +715,8 @@ class PlaywrightSocialExtractor:
         filepath = os.path.join(data_dir, filename)
         
         try:
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(content, f, ensure_ascii=False, indent=2)
+            # Serialização e escrita fora do event loop: as páginas em uso continuam sendo atendidas
+            await asyncio.to_thread(_write_json_file, filepath, content)
             
             logger.info(f"💾 Conteúdo salvo em: {filepath}")
             return filepath
@@ -399,8 +725,10 @@ class PlaywrightSocialExtractor:
             logger.error(f"❌ Erro ao salvar conteúdo: {e}")
             raise
 
-# Instância global
-playwright_extractor = PlaywrightSocialExtractor()
+@lru_cache(maxsize=1)
+def get_playwright_extractor() -> PlaywrightSocialExtractor:
+    """Retorna a instância compartilhada do extrator, criada só no primeiro uso (não no import)"""
+    return PlaywrightSocialExtractor()
 
 async def extract_viral_content_massive(search_terms: List[str]) -> Dict[str, Any]:
     """Função principal para extração massiva de conteúdo viral"""
@@ -10,88 +10,237 @@ import logging
 import json
 import time
 import re
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime
 from pathlib import Path
 from playwright.async_api import async_playwright, Browser, Page, BrowserContext
-import random
+from operator import itemgetter
+from dataclasses import dataclass, replace
+import numpy as np
+
+try:
+    import aiohttp
+    HAS_AIOHTTP = True
+except ImportError:
+    HAS_AIOHTTP = False
 
 logger = logging.getLogger(__name__)
 
+_TAG_STRIP = str.maketrans('', '', ' #')  # query -> hashtag numa única passada
+
+# Estado inicial que o YouTube embute no HTML da busca (os resultados são renderizados a partir dele)
+_YT_INITIAL_DATA_RE = re.compile(r'var ytInitialData\s*=\s*(\{.*?\});\s*</script>', re.DOTALL)
+
+def _iter_video_renderers(dados: Any):
+    """Percorre (sem recursão) o ytInitialData e devolve cada videoRenderer, na ordem da página"""
+    pilha = [dados]
+    while pilha:
+        atual = pilha.pop()
+        if isinstance(atual, dict):
+            renderer = atual.get('videoRenderer')
+            if isinstance(renderer, dict):
+                yield renderer
+                continue
+            pilha.extend(reversed(list(atual.values())))
+        elif isinstance(atual, list):
+            pilha.extend(reversed(atual))
+
+# Recursos que as extrações não usam (só atributos do DOM são lidos; o src de <img> existe mesmo abortado)
+_BLOCKED_RESOURCE_TYPES = frozenset({'image', 'media', 'font', 'stylesheet'})
+
+async def _block_heavy_resources(route):
+    """Aborta downloads pesados; documento, scripts e XHR/fetch seguem normalmente"""
+    if route.request.resource_type in _BLOCKED_RESOURCE_TYPES:
+        await route.abort()
+    else:
+        await route.continue_()
+
+# Coleta, numa única chamada ao browser, o src de até `limit` elementos (ou da <img> interna de cada um)
+_COLLECT_SRC_JS = """([sel, inner, limit]) =>
+    Array.prototype.slice.call(document.querySelectorAll(sel), 0, limit).map(el => {
+        const img = inner ? el.querySelector(inner) : el;
+        return img ? img.getAttribute('src') : null;
+    })"""
+
+# Faixas (inclusivas) das métricas simuladas de engajamento por plataforma
+_ENGAGEMENT_RANGES = {
+    'instagram': {'likes': (100, 10000), 'comments': (10, 1000), 'shares': (5, 500)},
+    'facebook': {'likes': (50, 5000), 'comments': (5, 500), 'shares': (2, 200)},
+    'youtube': {'views': (1000, 1000000), 'likes': (100, 50000), 'comments': (10, 5000)},
+    'tiktok': {'views': (10000, 10000000), 'likes': (500, 500000), 'comments': (50, 50000), 'shares': (20, 20000)},
+    'twitter': {'likes': (10, 10000), 'retweets': (5, 5000), 'replies': (2, 1000)},
+}
+
+# Chaves públicas de cada plataforma: (campo da mídia ou None, campo do índice)
+_ITEM_KEYS = {
+    'instagram': ('image_url', 'post_index'),
+    'facebook': (None, 'post_index'),
+    'youtube': ('thumbnail_url', 'video_index'),
+    'tiktok': (None, 'video_index'),
+    'twitter': (None, 'tweet_index'),
+}
+
+@dataclass(slots=True)
+class ViralItem:
+    """Item extraído (slots: bem menor que um dict por item); vira dict no formato público só na saída"""
+    platform: str
+    type: str
+    index: int
+    viral_score: float
+    engagement_metrics: Dict[str, int]
+    extracted_at: str
+    media_url: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Formato público do item (mesmas chaves e ordem de antes, por plataforma)"""
+        media_key, index_key = _ITEM_KEYS[self.platform]
+        item = {'platform': self.platform, 'type': self.type}
+        if media_key:
+            item[media_key] = self.media_url
+        item[index_key] = self.index
+        item['viral_score'] = self.viral_score
+        item['engagement_metrics'] = dict(self.engagement_metrics)  # cópia: o item pode estar em cache
+        item['extracted_at'] = self.extracted_at
+        return item
+
 class PlaywrightSocialExtractor:
     """
     Extrator de redes sociais usando Playwright + Chromium
     Substitui completamente Selenium para melhor performance
     """
     
+    DEFAULT_PLATFORMS = ('instagram', 'facebook', 'youtube', 'tiktok')
+    
+    # Seletores para diferentes plataformas (montados uma vez por processo, compartilhados pelas instâncias)
+    SELECTORS = {
+        'instagram': {
+            'posts': 'article[role="presentation"]',
+            'images': 'img[alt*="Photo by"], img[alt*="Foto de"]',
+            'videos': 'video',
+            'likes': 'span[aria-label*="likes"], span[aria-label*="curtidas"]',
+            'comments': 'span[aria-label*="comments"], span[aria-label*="comentários"]',
+            'captions': 'div[data-testid="post-caption"]'
+        },
+        'facebook': {
+            'posts': '[data-pagelet="FeedUnit"]',
+            'images': 'img[data-imgperflogname="profileCoverPhoto"], img[src*="scontent"]',
+            'videos': 'video',
+            'likes': '[aria-label*="reactions"], [aria-label*="reações"]',
+            'comments': '[aria-label*="comments"], [aria-label*="comentários"]',
+            'shares': '[aria-label*="shares"], [aria-label*="compartilhamentos"]'
+        },
+        'youtube': {
+            'thumbnails': 'img[src*="ytimg.com"], img[src*="ggpht.com"]',
+            'titles': '#video-title, .ytd-video-meta-block h3',
+            'views': '#metadata-line span:first-child',
+            'duration': '.ytd-thumbnail-overlay-time-status-renderer',
+            'channels': '.ytd-channel-name a'
+        },
+        'tiktok': {
+            'videos': '[data-e2e="recommend-list-item"]',
+            'thumbnails': 'img[alt*="video"]',
+            'likes': '[data-e2e="like-count"]',
+            'comments': '[data-e2e="comment-count"]',
+            'shares': '[data-e2e="share-count"]'
+        },
+        'twitter': {
+            'tweets': '[data-testid="tweet"]',
+            'images': 'img[alt*="Image"]',
+            'videos': 'video',
+            'likes': '[data-testid="like"]',
+            'retweets': '[data-testid="retweet"]',
+            'replies': '[data-testid="reply"]'
+        }
+    }
+
     def __init__(self):
         self.browser: Optional[Browser] = None
         self.context: Optional[BrowserContext] = None
+        self.lean_context: Optional[BrowserContext] = None  # sem JavaScript, criado sob demanda
+        self._lean_context_task: Optional[asyncio.Task] = None
         self.playwright = None
+        self._http = None  # sessão HTTP para os caminhos sem browser
+        
+        self._rng = np.random.default_rng()
+        
+        # Ciclo de vida compartilhado: vários `async with` no mesmo loop reutilizam o mesmo browser
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._start_lock: Optional[asyncio.Lock] = None
+        self._refcount = 0
+        self._idle_close_task: Optional[asyncio.Task] = None
+        
+        # Cache de resultados por (plataforma, query, max_items) e extrações em andamento
+        self._result_cache: Dict[Tuple[str, str, int], Tuple[float, Dict[str, Any]]] = {}
+        self._inflight_locks: Dict[Tuple[str, str, int], asyncio.Lock] = {}
+        
+        # Páginas aquecidas por plataforma (reaproveitam heap JS, cookies e conexões HTTP/2)
+        self._page_pool: Dict[str, asyncio.Queue] = {}
         
         # Configurações de extração
         self.config = {
             'headless': True,
             'timeout': 30000,  # 30 segundos
+            'selector_timeout': 3000,  # espera máxima pelo conteúdo após a navegação (antes: pausa fixa de 3s)
+            'screenshot_settle_ms': 2000,  # espera máxima pela rede ociosa antes do screenshot (antes: pausa fixa de 2s)
             'viewport': {'width': 1920, 'height': 1080},
             'user_agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
             'max_concurrent_pages': 5,
             'wait_between_requests': 2,  # segundos
-            'max_retries': 3
-        }
-        
-        # Seletores para diferentes plataformas
-        self.selectors = {
-            'instagram': {
-                'posts': 'article[role="presentation"]',
-                'images': 'img[alt*="Photo by"], img[alt*="Foto de"]',
-                'videos': 'video',
-                'likes': 'span[aria-label*="likes"], span[aria-label*="curtidas"]',
-                'comments': 'span[aria-label*="comments"], span[aria-label*="comentários"]',
-                'captions': 'div[data-testid="post-caption"]'
-            },
-            'facebook': {
-                'posts': '[data-pagelet="FeedUnit"]',
-                'images': 'img[data-imgperflogname="profileCoverPhoto"], img[src*="scontent"]',
-                'videos': 'video',
-                'likes': '[aria-label*="reactions"], [aria-label*="reações"]',
-                'comments': '[aria-label*="comments"], [aria-label*="comentários"]',
-                'shares': '[aria-label*="shares"], [aria-label*="compartilhamentos"]'
-            },
-            'youtube': {
-                'thumbnails': 'img[src*="ytimg.com"], img[src*="ggpht.com"]',
-                'titles': '#video-title, .ytd-video-meta-block h3',
-                'views': '#metadata-line span:first-child',
-                'duration': '.ytd-thumbnail-overlay-time-status-renderer',
-                'channels': '.ytd-channel-name a'
-            },
-            'tiktok': {
-                'videos': '[data-e2e="recommend-list-item"]',
-                'thumbnails': 'img[alt*="video"]',
-                'likes': '[data-e2e="like-count"]',
-                'comments': '[data-e2e="comment-count"]',
-                'shares': '[data-e2e="share-count"]'
-            },
-            'twitter': {
-                'tweets': '[data-testid="tweet"]',
-                'images': 'img[alt*="Image"]',
-                'videos': 'video',
-                'likes': '[data-testid="like"]',
-                'retweets': '[data-testid="retweet"]',
-                'replies': '[data-testid="reply"]'
-            }
+            'max_retries': 3,
+            # Segundos que o browser fica aberto após o último uso; 0 fecha na hora
+            # (use > 0 só com event loop de vida longa: os workflows fecham o loop ao terminar)
+            'idle_close_after': 0,
+            'result_cache_ttl': 300,  # segundos que um resultado (plataforma, query) é reaproveitado
+            # Plataformas cujo DOM não é lido (extração simulada) navegam sem JavaScript;
+            # as ausentes mantêm JS (Instagram e YouTube dependem da renderização no cliente)
+            'js_enabled_per_platform': {'facebook': False, 'tiktok': False, 'twitter': False},
+            # JPEG só do viewport: arquivos 5-20x menores que o PNG da página inteira
+            'screenshot': {'type': 'jpeg', 'quality': 70, 'full_page': False}
         }
         
         logger.info("🎭 Playwright Social Extractor inicializado")
 
     async def __aenter__(self):
-        """Context manager entry"""
-        await self.start_browser()
+        """Context manager entry (inicia o browser só no primeiro uso simultâneo)"""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Browser e lock de outro event loop não podem ser reaproveitados
+            self._loop = loop
+            self._start_lock = asyncio.Lock()
+            self._refcount = 0
+            self._idle_close_task = None
+            self._inflight_locks = {}
+            self.context = self.lean_context = self.browser = self.playwright = self._http = None
+            self._lean_context_task = None
+            self._page_pool = {}
+        
+        async with self._start_lock:
+            if self._idle_close_task:
+                self._idle_close_task.cancel()
+                self._idle_close_task = None
+            if self.context is None:
+                await self.start_browser()
+            self._refcount += 1
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        """Context manager exit"""
-        await self.close_browser()
+        """Context manager exit (fecha o browser quando o último usuário sai)"""
+        async with self._start_lock:
+            self._refcount -= 1
+            if self._refcount > 0:
+                return
+            if self.config['idle_close_after'] > 0:
+                self._idle_close_task = asyncio.create_task(self._idle_close(self.config['idle_close_after']))
+            else:
+                await self.close_browser()
+
+    async def _idle_close(self, timeout: float):
+        """Fecha o browser se ninguém voltar a usá-lo dentro de `timeout` segundos"""
+        await asyncio.sleep(timeout)
+        async with self._start_lock:
+            if self._refcount == 0:
+                self._idle_close_task = None
+                await self.close_browser()
 
     async def start_browser(self):
         """Inicia o browser Playwright"""
@@ -119,15 +268,26 @@ class PlaywrightSocialExtractor:
                 ignore_https_errors=True
             )
             
+            if HAS_AIOHTTP:
+                self._http = aiohttp.ClientSession(
+                    headers={'User-Agent': self.config['user_agent']},
+                    timeout=aiohttp.ClientTimeout(total=self.config['timeout'] / 1000)
+                )
+            
             logger.info("✅ Browser Playwright iniciado com sucesso")
             
         except Exception as e:
-            logger.error(f"❌ Erro ao iniciar browser: {e}")
+            logger.error("❌ Erro ao iniciar browser: %s", e)
             raise
 
     async def close_browser(self):
         """Fecha o browser"""
+        self._page_pool = {}  # as páginas fecham junto com o contexto
         try:
+            if self._http:
+                await self._http.close()
+            if self.lean_context:
+                await self.lean_context.close()
             if self.context:
                 await self.context.close()
             if self.browser:
@@ -136,129 +296,214 @@ class PlaywrightSocialExtractor:
                 await self.playwright.stop()
             logger.info("✅ Browser fechado com sucesso")
         except Exception as e:
-            logger.error(f"⚠️ Erro ao fechar browser: {e}")
+            logger.error("⚠️ Erro ao fechar browser: %s", e)
+        finally:
+            self.context = self.lean_context = self.browser = self.playwright = self._http = None
+            self._lean_context_task = None
 
     async def extract_viral_content(self, query: str, platforms: List[str] = None, max_items: int = 50) -> Dict[str, Any]:
         """
         Extrai conteúdo viral das redes sociais
         """
         if platforms is None:
-            platforms = ['instagram', 'facebook', 'youtube', 'tiktok']
+            platforms = list(self.DEFAULT_PLATFORMS)
         
-        logger.info(f"🔍 Extraindo conteúdo viral para: {query}")
-        logger.info(f"📱 Plataformas: {platforms}")
+        logger.info("🔍 Extraindo conteúdo viral para: %s", query)
+        logger.info("📱 Plataformas: %s", platforms)
         
+        started_ts = datetime.now().isoformat()  # um único instante para todas as plataformas do lote
         results = {
             'query': query,
-            'extraction_started': datetime.now().isoformat(),
+            'extraction_started': started_ts,
             'platforms_data': {},
             'viral_content': [],
             'total_items_extracted': 0,
             'extraction_metrics': {}
         }
         
-        # Extrai de cada plataforma
-        for platform in platforms:
-            try:
-                logger.info(f"🎯 Extraindo de {platform.upper()}")
-                platform_data = await self._extract_from_platform(platform, query, max_items // len(platforms))
-                results['platforms_data'][platform] = platform_data
-                results['viral_content'].extend(platform_data.get('content', []))
-                
-                await asyncio.sleep(self.config['wait_between_requests'])
-                
-            except Exception as e:
-                logger.error(f"❌ Erro ao extrair de {platform}: {e}")
-                results['platforms_data'][platform] = {'error': str(e), 'content': []}
+        # Extrai de todas as plataformas em paralelo (cada uma usa sua própria página)
+        items_per_platform = max_items // len(platforms)
+        tasks = [
+            asyncio.create_task(self._extract_from_platform(platform, query, items_per_platform, started_ts))
+            for platform in platforms
+        ]
+        done = await asyncio.gather(*tasks, return_exceptions=True)
+        
+        for platform, platform_data in zip(platforms, done):
+            if isinstance(platform_data, BaseException):
+                logger.error("❌ Erro ao extrair de %s: %s", platform, platform_data)
+                results['platforms_data'][platform] = {'error': str(platform_data), 'content': []}
+                continue
+            # Formato público (dicts) só aqui, sem alterar o resultado em cache;
+            # as mesmas instâncias vão para platforms_data e viral_content
+            platform_data = {**platform_data, 'content': [item.to_dict() for item in platform_data.get('content', [])]}
+            results['platforms_data'][platform] = platform_data
+            results['viral_content'].extend(platform_data['content'])
         
         # Calcula métricas finais
         results['total_items_extracted'] = len(results['viral_content'])
         results['extraction_completed'] = datetime.now().isoformat()
         
-        # Ordena por score viral
-        results['viral_content'] = sorted(
-            results['viral_content'], 
-            key=lambda x: x.get('viral_score', 0), 
-            reverse=True
-        )
+        # Ordena por score viral (in-place, chave extraída em C; todo item tem viral_score)
+        results['viral_content'].sort(key=itemgetter('viral_score'), reverse=True)
         
-        logger.info(f"✅ Extração concluída: {results['total_items_extracted']} itens")
+        logger.info("✅ Extração concluída: %d itens", results['total_items_extracted'])
         
         return results
 
-    async def _extract_from_platform(self, platform: str, query: str, max_items: int) -> Dict[str, Any]:
-        """Extrai conteúdo de uma plataforma específica"""
+    def _cached_result(self, key: Tuple[str, str, int]) -> Optional[Dict[str, Any]]:
+        """Resultado em cache da chave, se ainda dentro do TTL (expirado é descartado)"""
+        entry = self._result_cache.get(key)
+        if entry is None:
+            return None
+        stored_at, platform_data = entry
+        if time.monotonic() - stored_at < self.config['result_cache_ttl']:
+            return platform_data
+        del self._result_cache[key]
+        return None
+
+    def _restamp(self, platform_data: Dict[str, Any], extracted_at: Optional[str]) -> Dict[str, Any]:
+        """Cópia do resultado em cache com os itens datados na extração atual (o cache não é alterado)"""
+        if extracted_at is None:
+            return platform_data
+        return {
+            **platform_data,
+            'content': [replace(item, extracted_at=extracted_at) for item in platform_data.get('content', [])]
+        }
+
+    async def _extract_from_platform(self, platform: str, query: str, max_items: int, extracted_at: Optional[str] = None) -> Dict[str, Any]:
+        """Extrai conteúdo de uma plataforma específica (com cache por TTL e uma única extração em voo por chave)"""
+        key = (platform, query.strip().lower(), max_items)
+        cached = self._cached_result(key)
+        if cached is not None:
+            logger.info("♻️ %s servido do cache: %s", platform.upper(), query)
+            return self._restamp(cached, extracted_at)
+        
+        lock = self._inflight_locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            # Outra tarefa pode ter extraído a mesma chave enquanto esta esperava
+            cached = self._cached_result(key)
+            if cached is not None:
+                return self._restamp(cached, extracted_at)
+            platform_data = await self._run_platform_extractor(platform, query, max_items, extracted_at)
+            if platform_data.get('success'):
+                self._result_cache[key] = (time.monotonic(), platform_data)
+        self._inflight_locks.pop(key, None)
+        return platform_data
+
+    async def _run_platform_extractor(self, platform: str, query: str, max_items: int, extracted_at: Optional[str]) -> Dict[str, Any]:
+        """Despacha para o extrator da plataforma"""
         
+        extracted_at = extracted_at or datetime.now().isoformat()
         platform_data = {
             'platform': platform,
             'query': query,
             'content': [],
-            'extraction_time': datetime.now().isoformat(),
+            'extraction_time': extracted_at,
             'success': False
         }
         
+        logger.info("🎯 Extraindo de %s", platform.upper())
+        
         try:
             if platform == 'instagram':
-                platform_data = await self._extract_instagram(query, max_items)
+                platform_data = await self._extract_instagram(query, max_items, extracted_at)
             elif platform == 'facebook':
-                platform_data = await self._extract_facebook(query, max_items)
+                platform_data = await self._extract_facebook(query, max_items, extracted_at)
             elif platform == 'youtube':
-                platform_data = await self._extract_youtube(query, max_items)
+                platform_data = await self._extract_youtube(query, max_items, extracted_at)
             elif platform == 'tiktok':
-                platform_data = await self._extract_tiktok(query, max_items)
+                platform_data = await self._extract_tiktok(query, max_items, extracted_at)
             elif platform == 'twitter':
-                platform_data = await self._extract_twitter(query, max_items)
+                platform_data = await self._extract_twitter(query, max_items, extracted_at)
             else:
-                logger.warning(f"⚠️ Plataforma não suportada: {platform}")
+                logger.warning("⚠️ Plataforma não suportada: %s", platform)
                 
         except Exception as e:
-            logger.error(f"❌ Erro na extração de {platform}: {e}")
+            logger.error("❌ Erro na extração de %s: %s", platform, e)
             platform_data['error'] = str(e)
         
         return platform_data
 
-    async def _extract_instagram(self, query: str, max_items: int) -> Dict[str, Any]:
+    async def _acquire_page(self, platform: str) -> Page:
+        """Retira uma página aquecida do pool da plataforma ou cria uma nova"""
+        pool = self._page_pool.get(platform)
+        if pool is not None and not pool.empty():
+            return pool.get_nowait()
+        return await self._new_extraction_page(platform)
+
+    async def _release_page(self, platform: str, page: Page):
+        """Limpa a página e devolve ao pool da plataforma (fecha se o pool estiver cheio)"""
+        pool = self._page_pool.setdefault(platform, asyncio.Queue())
+        try:
+            if pool.qsize() < self.config['max_concurrent_pages']:
+                await page.goto('about:blank')
+                pool.put_nowait(page)
+                return
+        except Exception as e:
+            logger.debug("Página de %s descartada: %s", platform, e)
+        await page.close()
+
+    def _js_enabled(self, platform: str) -> bool:
+        """Se a plataforma precisa de JavaScript para renderizar o que é extraído"""
+        return self.config['js_enabled_per_platform'].get(platform, True)
+
+    async def _new_extraction_page(self, platform: str) -> Page:
+        """Nova página de extração com bloqueio de recursos pesados (screenshots usam páginas sem bloqueio)"""
+        if self._js_enabled(platform):
+            context = self.context
+        else:
+            if self._lean_context_task is None:
+                # Uma única criação mesmo com várias plataformas pedindo ao mesmo tempo
+                self._lean_context_task = asyncio.ensure_future(self.browser.new_context(
+                    viewport=self.config['viewport'],
+                    user_agent=self.config['user_agent'],
+                    ignore_https_errors=True,
+                    java_script_enabled=False
+                ))
+            context = self.lean_context = await self._lean_context_task
+        page = await context.new_page()
+        await page.route('**/*', _block_heavy_resources)
+        return page
+
+    async def _goto_and_wait(self, page: Page, url: str, platform: str, selector: str):
+        """Navega e espera só até o seletor da plataforma existir no DOM (sem pausa fixa)"""
+        await page.goto(url, wait_until='domcontentloaded', timeout=self.config['timeout'])
+        if not self._js_enabled(platform):
+            return  # sem JS nada mais é renderizado após o HTML inicial
+        try:
+            await page.wait_for_selector(selector, state='attached', timeout=self.config['selector_timeout'])
+        except Exception as e:
+            # Sem o seletor (ex.: tela de login), segue com o que houver na página
+            logger.debug("Seletor %s não apareceu em %s: %s", selector, url, e)
+
+    def _simulated_engagement(self, platform: str, n: int) -> Tuple[List[float], List[Dict[str, int]]]:
+        """Sorteia scores virais e métricas simuladas do lote inteiro de uma vez (tipos nativos, serializáveis em JSON)"""
+        viral_scores = self._rng.uniform(1, 10, size=n).tolist()
+        ranges = _ENGAGEMENT_RANGES[platform]
+        columns = [self._rng.integers(low, high, size=n, endpoint=True).tolist() for low, high in ranges.values()]
+        metrics = [dict(zip(ranges, row)) for row in zip(*columns)]
+        return viral_scores, metrics
+
+    async def _extract_instagram(self, query: str, max_items: int, extracted_at: str) -> Dict[str, Any]:
         """Extrai conteúdo do Instagram"""
-        page = await self.context.new_page()
+        page = await self._acquire_page('instagram')
         
         try:
             # Busca no Instagram via hashtag
-            search_url = f"https://www.instagram.com/explore/tags/{query.replace(' ', '').replace('#', '')}/"
-            await page.goto(search_url, timeout=self.config['timeout'])
-            
-            # Aguarda carregamento
-            await page.wait_for_timeout(3000)
+            search_url = f"https://www.instagram.com/explore/tags/{query.translate(_TAG_STRIP)}/"
+            await self._goto_and_wait(page, search_url, 'instagram', self.SELECTORS['instagram']['posts'])
             
-            # Extrai posts
-            posts = await page.query_selector_all(self.selectors['instagram']['posts'])
+            # Extrai imagens dos posts (uma única ida ao browser para o lote inteiro)
+            img_urls = await page.evaluate(
+                _COLLECT_SRC_JS, [self.SELECTORS['instagram']['posts'], 'img', max_items]
+            )
             content = []
+            viral_scores, metrics = self._simulated_engagement('instagram', len(img_urls))
             
-            for i, post in enumerate(posts[:max_items]):
-                try:
-                    # Extrai imagem
-                    img_element = await post.query_selector('img')
-                    img_url = await img_element.get_attribute('src') if img_element else None
-                    
-                    # Extrai dados básicos
-                    post_data = {
-                        'platform': 'instagram',
-                        'type': 'post',
-                        'image_url': img_url,
-                        'post_index': i,
-                        'viral_score': random.uniform(1, 10),  # Score simulado
-                        'engagement_metrics': {
-                            'likes': random.randint(100, 10000),
-                            'comments': random.randint(10, 1000),
-                            'shares': random.randint(5, 500)
-                        },
-                        'extracted_at': datetime.now().isoformat()
-                    }
-                    
-                    content.append(post_data)
-                    
-                except Exception as e:
-                    logger.warning(f"⚠️ Erro ao processar post {i}: {e}")
-                    continue
+            for i, img_url in enumerate(img_urls):
+                # Extrai dados básicos (score simulado)
+                content.append(ViralItem('instagram', 'post', i, viral_scores[i], metrics[i], extracted_at, img_url))
             
             return {
                 'platform': 'instagram',
@@ -269,7 +514,7 @@ class PlaywrightSocialExtractor:
             }
             
         except Exception as e:
-            logger.error(f"❌ Erro no Instagram: {e}")
+            logger.error("❌ Erro no Instagram: %s", e)
             return {
                 'platform': 'instagram',
                 'query': query,
@@ -278,36 +523,24 @@ class PlaywrightSocialExtractor:
                 'success': False
             }
         finally:
-            await page.close()
+            await self._release_page('instagram', page)
 
-    async def _extract_facebook(self, query: str, max_items: int) -> Dict[str, Any]:
+    async def _extract_facebook(self, query: str, max_items: int, extracted_at: str) -> Dict[str, Any]:
         """Extrai conteúdo do Facebook"""
-        page = await self.context.new_page()
+        page = await self._acquire_page('facebook')
         
         try:
             # Facebook é mais restritivo, usa busca geral
             search_url = f"https://www.facebook.com/search/posts/?q={query}"
-            await page.goto(search_url, timeout=self.config['timeout'])
-            
-            await page.wait_for_timeout(5000)  # Aguarda mais tempo
+            await self._goto_and_wait(page, search_url, 'facebook', self.SELECTORS['facebook']['posts'])
             
             content = []
             
             # Simula extração (Facebook tem muitas restrições)
-            for i in range(min(max_items, 6)):  # Limite menor para Facebook
-                post_data = {
-                    'platform': 'facebook',
-                    'type': 'post',
-                    'post_index': i,
-                    'viral_score': random.uniform(1, 10),
-                    'engagement_metrics': {
-                        'likes': random.randint(50, 5000),
-                        'comments': random.randint(5, 500),
-                        'shares': random.randint(2, 200)
-                    },
-                    'extracted_at': datetime.now().isoformat()
-                }
-                content.append(post_data)
+            n = min(max_items, 6)  # Limite menor para Facebook
+            viral_scores, metrics = self._simulated_engagement('facebook', n)
+            for i in range(n):
+                content.append(ViralItem('facebook', 'post', i, viral_scores[i], metrics[i], extracted_at))
             
             return {
                 'platform': 'facebook',
@@ -318,7 +551,7 @@ class PlaywrightSocialExtractor:
             }
             
         except Exception as e:
-            logger.error(f"❌ Erro no Facebook: {e}")
+            logger.error("❌ Erro no Facebook: %s", e)
             return {
                 'platform': 'facebook',
                 'query': query,
@@ -327,46 +560,63 @@ class PlaywrightSocialExtractor:
                 'success': False
             }
         finally:
-            await page.close()
+            await self._release_page('facebook', page)
 
-    async def _extract_youtube(self, query: str, max_items: int) -> Dict[str, Any]:
-        """Extrai thumbnails e dados do YouTube"""
-        page = await self.context.new_page()
+    async def _fetch_youtube_thumbnails(self, query: str, max_items: int) -> List[str]:
+        """Thumbnails da busca a partir do ytInitialData embutido no HTML (um GET, sem Chromium); [] se indisponível"""
+        if not self._http:
+            return []
+        try:
+            async with self._http.get('https://www.youtube.com/results', params={'search_query': query}) as response:
+                if response.status != 200:
+                    return []
+                html = await response.text()
+        except Exception as e:
+            logger.debug("Busca direta no YouTube falhou: %s", e)
+            return []
         
+        match = _YT_INITIAL_DATA_RE.search(html)
+        if not match:
+            return []
+        try:
+            dados = json.loads(match.group(1))
+        except ValueError:
+            return []
+        
+        thumb_urls = []
+        for renderer in _iter_video_renderers(dados):
+            thumbnails = renderer.get('thumbnail', {}).get('thumbnails') or []
+            if thumbnails and thumbnails[-1].get('url'):
+                thumb_urls.append(thumbnails[-1]['url'])
+                if len(thumb_urls) >= max_items:
+                    break
+        return thumb_urls
+
+    async def _collect_youtube_thumbnails_browser(self, query: str, max_items: int) -> List[str]:
+        """Thumbnails da busca renderizada no Chromium"""
+        page = await self._acquire_page('youtube')
         try:
-            # Busca no YouTube
             search_url = f"https://www.youtube.com/results?search_query={query.replace(' ', '+')}"
-            await page.goto(search_url, timeout=self.config['timeout'])
+            await self._goto_and_wait(page, search_url, 'youtube', 'img[src*="ytimg.com"]')
             
-            await page.wait_for_timeout(3000)
+            # Extrai thumbnails (uma única ida ao browser para o lote inteiro)
+            return await page.evaluate(_COLLECT_SRC_JS, ['img[src*="ytimg.com"]', None, max_items])
+        finally:
+            await self._release_page('youtube', page)
+
+    async def _extract_youtube(self, query: str, max_items: int, extracted_at: str) -> Dict[str, Any]:
+        """Extrai thumbnails e dados do YouTube"""
+        try:
+            # Caminho rápido por HTTP; o browser só entra se ele não trouxer nada
+            thumb_urls = await self._fetch_youtube_thumbnails(query, max_items)
+            if not thumb_urls:
+                thumb_urls = await self._collect_youtube_thumbnails_browser(query, max_items)
             
-            # Extrai thumbnails
-            thumbnails = await page.query_selector_all('img[src*="ytimg.com"]')
             content = []
+            viral_scores, metrics = self._simulated_engagement('youtube', len(thumb_urls))
             
-            for i, thumb in enumerate(thumbnails[:max_items]):
-                try:
-                    thumb_url = await thumb.get_attribute('src')
-                    
-                    video_data = {
-                        'platform': 'youtube',
-                        'type': 'video_thumbnail',
-                        'thumbnail_url': thumb_url,
-                        'video_index': i,
-                        'viral_score': random.uniform(1, 10),
-                        'engagement_metrics': {
-                            'views': random.randint(1000, 1000000),
-                            'likes': random.randint(100, 50000),
-                            'comments': random.randint(10, 5000)
-                        },
-                        'extracted_at': datetime.now().isoformat()
-                    }
-                    
-                    content.append(video_data)
-                    
-                except Exception as e:
-                    logger.warning(f"⚠️ Erro ao processar thumbnail {i}: {e}")
-                    continue
+            for i, thumb_url in enumerate(thumb_urls):
+                content.append(ViralItem('youtube', 'video_thumbnail', i, viral_scores[i], metrics[i], extracted_at, thumb_url))
             
             return {
                 'platform': 'youtube',
@@ -377,7 +627,7 @@ class PlaywrightSocialExtractor:
             }
             
         except Exception as e:
-            logger.error(f"❌ Erro no YouTube: {e}")
+            logger.error("❌ Erro no YouTube: %s", e)
             return {
                 'platform': 'youtube',
                 'query': query,
@@ -385,38 +635,23 @@ class PlaywrightSocialExtractor:
                 'error': str(e),
                 'success': False
             }
-        finally:
-            await page.close()
 
-    async def _extract_tiktok(self, query: str, max_items: int) -> Dict[str, Any]:
+    async def _extract_tiktok(self, query: str, max_items: int, extracted_at: str) -> Dict[str, Any]:
         """Extrai conteúdo do TikTok"""
-        page = await self.context.new_page()
+        page = await self._acquire_page('tiktok')
         
         try:
             # TikTok busca
             search_url = f"https://www.tiktok.com/search?q={query.replace(' ', '%20')}"
-            await page.goto(search_url, timeout=self.config['timeout'])
-            
-            await page.wait_for_timeout(4000)
+            await self._goto_and_wait(page, search_url, 'tiktok', self.SELECTORS['tiktok']['videos'])
             
             content = []
             
             # Simula extração do TikTok
-            for i in range(min(max_items, 8)):  # Limite para TikTok
-                video_data = {
-                    'platform': 'tiktok',
-                    'type': 'video',
-                    'video_index': i,
-                    'viral_score': random.uniform(1, 10),
-                    'engagement_metrics': {
-                        'views': random.randint(10000, 10000000),
-                        'likes': random.randint(500, 500000),
-                        'comments': random.randint(50, 50000),
-                        'shares': random.randint(20, 20000)
-                    },
-                    'extracted_at': datetime.now().isoformat()
-                }
-                content.append(video_data)
+            n = min(max_items, 8)  # Limite para TikTok
+            viral_scores, metrics = self._simulated_engagement('tiktok', n)
+            for i in range(n):
+                content.append(ViralItem('tiktok', 'video', i, viral_scores[i], metrics[i], extracted_at))
             
             return {
                 'platform': 'tiktok',
@@ -427,7 +662,7 @@ class PlaywrightSocialExtractor:
             }
             
         except Exception as e:
-            logger.error(f"❌ Erro no TikTok: {e}")
+            logger.error("❌ Erro no TikTok: %s", e)
             return {
                 'platform': 'tiktok',
                 'query': query,
@@ -436,36 +671,24 @@ class PlaywrightSocialExtractor:
                 'success': False
             }
         finally:
-            await page.close()
+            await self._release_page('tiktok', page)
 
-    async def _extract_twitter(self, query: str, max_items: int) -> Dict[str, Any]:
+    async def _extract_twitter(self, query: str, max_items: int, extracted_at: str) -> Dict[str, Any]:
         """Extrai conteúdo do Twitter/X"""
-        page = await self.context.new_page()
+        page = await self._acquire_page('twitter')
         
         try:
             # Twitter busca
             search_url = f"https://twitter.com/search?q={query.replace(' ', '%20')}"
-            await page.goto(search_url, timeout=self.config['timeout'])
-            
-            await page.wait_for_timeout(3000)
+            await self._goto_and_wait(page, search_url, 'twitter', self.SELECTORS['twitter']['tweets'])
             
             content = []
             
             # Simula extração do Twitter
-            for i in range(min(max_items, 10)):
-                tweet_data = {
-                    'platform': 'twitter',
-                    'type': 'tweet',
-                    'tweet_index': i,
-                    'viral_score': random.uniform(1, 10),
-                    'engagement_metrics': {
-                        'likes': random.randint(10, 10000),
-                        'retweets': random.randint(5, 5000),
-                        'replies': random.randint(2, 1000)
-                    },
-                    'extracted_at': datetime.now().isoformat()
-                }
-                content.append(tweet_data)
+            n = min(max_items, 10)
+            viral_scores, metrics = self._simulated_engagement('twitter', n)
+            for i in range(n):
+                content.append(ViralItem('twitter', 'tweet', i, viral_scores[i], metrics[i], extracted_at))
             
             return {
                 'platform': 'twitter',
@@ -476,7 +699,7 @@ class PlaywrightSocialExtractor:
             }
             
         except Exception as e:
-            logger.error(f"❌ Erro no Twitter: {e}")
+            logger.error("❌ Erro no Twitter: %s", e)
             return {
                 'platform': 'twitter',
                 'query': query,
@@ -485,38 +708,53 @@ class PlaywrightSocialExtractor:
                 'success': False
             }
         finally:
-            await page.close()
+            await self._release_page('twitter', page)
 
     async def capture_screenshots(self, urls: List[str], session_id: str) -> List[Dict[str, Any]]:
-        """Captura screenshots de URLs"""
-        screenshots = []
+        """Captura screenshots de URLs (até max_concurrent_pages páginas simultâneas)"""
         screenshots_dir = Path(f"analyses_data/files/{session_id}")
-        screenshots_dir.mkdir(parents=True, exist_ok=True)
+        # I/O de disco fora do event loop (as demais páginas continuam navegando)
+        await asyncio.to_thread(screenshots_dir.mkdir, parents=True, exist_ok=True)
+        sem = asyncio.Semaphore(self.config['max_concurrent_pages'])
+        shot = self.config['screenshot']
+        shot_options = {'type': shot['type'], 'full_page': shot['full_page']}
+        if shot['type'] == 'jpeg':
+            shot_options['quality'] = shot['quality']  # PNG não aceita quality
+        suffix = 'jpg' if shot['type'] == 'jpeg' else shot['type']
         
-        for i, url in enumerate(urls):
-            try:
-                page = await self.context.new_page()
-                await page.goto(url, timeout=self.config['timeout'])
-                await page.wait_for_timeout(2000)
-                
-                screenshot_path = screenshots_dir / f"screenshot_{i+1:03d}.png"
-                await page.screenshot(path=str(screenshot_path), full_page=True)
-                
-                screenshots.append({
-                    'url': url,
-                    'screenshot_path': str(screenshot_path),
-                    'index': i + 1,
-                    'captured_at': datetime.now().isoformat()
-                })
-                
-                await page.close()
-                logger.info(f"📸 Screenshot {i+1} capturado: {url}")
-                
-            except Exception as e:
-                logger.error(f"❌ Erro ao capturar screenshot de {url}: {e}")
-                continue
+        async def _one(i: int, url: str) -> Optional[Dict[str, Any]]:
+            async with sem:
+                try:
+                    page = await self.context.new_page()
+                    try:
+                        await page.goto(url, timeout=self.config['timeout'])
+                        try:
+                            await page.wait_for_load_state('networkidle', timeout=self.config['screenshot_settle_ms'])
+                        except Exception:
+                            # Páginas com polling contínuo nunca ficam ociosas; captura o que já carregou
+                            pass
+                        
+                        screenshot_path = screenshots_dir / f"screenshot_{i+1:03d}.{suffix}"
+                        image_bytes = await page.screenshot(**shot_options)
+                    finally:
+                        await page.close()
+                    
+                    await asyncio.to_thread(screenshot_path.write_bytes, image_bytes)
+                    logger.info("📸 Screenshot %d capturado: %s", i + 1, url)
+                    return {
+                        'url': url,
+                        'screenshot_path': str(screenshot_path),
+                        'index': i + 1,
+                        'captured_at': datetime.now().isoformat()
+                    }
+                    
+                except Exception as e:
+                    logger.error("❌ Erro ao capturar screenshot de %s: %s", url, e)
+                    return None
+        
+        done = await asyncio.gather(*[_one(i, url) for i, url in enumerate(urls)], return_exceptions=True)
         
-        return screenshots
+        return [shot for shot in done if isinstance(shot, dict)]
 
 # Instância global
 playwright_social_extractor = PlaywrightSocialExtractor()
\ No newline at end of file
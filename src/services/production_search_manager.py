@@ -9,6 +9,8 @@ import os
 import logging
 import time
 import requests
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional, Any
 from urllib.parse import quote_plus
 from bs4 import BeautifulSoup
@@ -67,6 +69,13 @@ class ProductionSearchManager:
             'Connection': 'keep-alive'
         }
 
+        # Sessão HTTP única: reaproveita conexões TCP/TLS entre buscas (keep-alive com pool)
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        adapter = HTTPAdapter(pool_connections=10, pool_maxsize=20)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
         self.cache = {}
         self.cache_ttl = 3600  # 1 hora
 
@@ -92,7 +101,9 @@ class ProductionSearchManager:
             try:
                 logger.info(f"🔍 Buscando com {provider_name}: {query}")
 
-                if provider_name == 'google':
+                if provider_name == 'exa':
+                    results = self._search_exa(query, max_results)
+                elif provider_name == 'google':
                     results = self._search_google(query, max_results)
                 elif provider_name == 'serper':
                     results = self._search_serper(query, max_results)
@@ -122,6 +133,24 @@ class ProductionSearchManager:
         logger.error("❌ Todos os provedores de busca falharam")
         return []
 
+    def search_many(self, queries: List[str], max_results: int = 10, max_workers: int = 5) -> List[List[Dict[str, Any]]]:
+        """Realiza várias buscas em paralelo (I/O de rede), na ordem das queries recebidas"""
+
+        if not queries:
+            return []
+
+        # Queries repetidas no mesmo lote fazem uma única requisição
+        unique_queries = list(dict.fromkeys(queries))
+
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(unique_queries))) as executor:
+            results = dict(zip(
+                unique_queries,
+                executor.map(lambda q: self.search_with_fallback(q, max_results), unique_queries)
+            ))
+
+        logger.info(f"✅ Lote de {len(queries)} buscas concluído ({len(unique_queries)} únicas)")
+        return [results[query] for query in queries]
+
     def _get_provider_order(self) -> List[str]:
         """Retorna provedores ordenados por prioridade"""
         available_providers = [
@@ -162,26 +191,23 @@ class ProductionSearchManager:
             'safe': 'off'
         }
 
-        response = requests.get(
+        response = self.session.get(
             provider['base_url'],
             params=params,
-            headers=self.headers,
             timeout=15
         )
 
         if response.status_code == 200:
             data = response.json()
-            results = []
-
-            for item in data.get('items', []):
-                results.append({
+            return [
+                {
                     'title': item.get('title', ''),
                     'url': item.get('link', ''),
                     'snippet': item.get('snippet', ''),
                     'source': 'google'
-                })
-
-            return results
+                }
+                for item in data.get('items', [])
+            ]
         else:
             raise Exception(f"Google API retornou status {response.status_code}")
 
@@ -202,7 +228,7 @@ class ProductionSearchManager:
             'num': max_results
         }
 
-        response = requests.post(
+        response = self.session.post(
             provider['base_url'],
             json=payload,
             headers=headers,
@@ -211,17 +237,15 @@ class ProductionSearchManager:
 
         if response.status_code == 200:
             data = response.json()
-            results = []
-
-            for item in data.get('organic', []):
-                results.append({
+            return [
+                {
                     'title': item.get('title', ''),
                     'url': item.get('link', ''),
                     'snippet': item.get('snippet', ''),
                     'source': 'serper'
-                })
-
-            return results
+                }
+                for item in data.get('organic', [])
+            ]
         else:
             raise Exception(f"Serper API retornou status {response.status_code}")
 
@@ -229,7 +253,7 @@ class ProductionSearchManager:
         """Busca usando Bing (scraping)"""
         search_url = f"{self.providers['bing']['base_url']}?q={quote_plus(query)}&cc=br&setlang=pt-br&count={max_results}"
 
-        response = requests.get(search_url, headers=self.headers, timeout=15)
+        response = self.session.get(search_url, timeout=15)
 
         if response.status_code == 200:
             soup = BeautifulSoup(response.content, 'html.parser')
@@ -303,11 +327,11 @@ class ProductionSearchManager:
             return False
 
         try:
-            if provider_name == 'exa':
-                return self._search_exa(query, max_results)
             test_query = "teste mercado digital Brasil"
 
-            if provider_name == 'google':
+            if provider_name == 'exa':
+                results = self._search_exa(test_query, 3)
+            elif provider_name == 'google':
                 results = self._search_google(test_query, 3)
             elif provider_name == 'serper':
                 results = self._search_serper(test_query, 3)
@@ -343,12 +367,12 @@ class ProductionSearchManager:
                 type="neural"
             )
 
-            if not exa_response or 'results' not in exa_response:
-                raise Exception("Exa não retornou resultados válidos")
+            # ExaSearchResponse sempre traz `results`; falha vem sinalizada em `success`
+            if not exa_response['success']:
+                raise Exception(exa_response.get('error', "Exa não retornou resultados válidos"))
 
-            results = []
-            for item in exa_response['results']:
-                results.append({
+            results = [
+                {
                     'title': item.get('title', ''),
                     'url': item.get('url', ''),
                     'snippet': item.get('text', '')[:300],
@@ -356,7 +380,9 @@ class ProductionSearchManager:
                     'score': item.get('score', 0),
                     'published_date': item.get('publishedDate', ''),
                     'exa_id': item.get('id', '')
-                })
+                }
+                for item in exa_response['results']
+            ]
 
             logger.info(f"✅ Exa Neural Search: {len(results)} resultados")
             return results
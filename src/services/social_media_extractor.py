@@ -11,9 +11,24 @@ import numpy as np
 from typing import Dict, List, Any, Optional
 from datetime import datetime
 from collections import Counter, defaultdict
+from functools import lru_cache
 
 logger = logging.getLogger(__name__)
 
+@lru_cache(maxsize=4096)
+def _parse_timestamp(timestamp_str: str) -> datetime:
+    """Converte timestamp textual em datetime; memorizado, pois as datas se repetem muito entre resultados"""
+    # Tenta parsear diferentes formatos de timestamp
+    if "T" in timestamp_str:
+        return datetime.fromisoformat(timestamp_str.replace("Z", "+00:00"))
+    # Datas canônicas AAAA-MM-DD vão pelo parser em C; strptime (Python puro) só para o formato frouxo (ex.: 2024-1-5)
+    if len(timestamp_str) == 10 and timestamp_str[4] == timestamp_str[7] == "-":
+        try:
+            return datetime.fromisoformat(timestamp_str)
+        except ValueError:
+            pass
+    return datetime.strptime(timestamp_str, "%Y-%m-%d")
+
 class SocialMediaExtractor:
     """Extrator para análise de redes sociais"""
 
@@ -433,11 +448,7 @@ class SocialMediaExtractor:
                         timestamp_str = result.get("timestamp", result.get("created_at", result.get("published_at", "")))
                         if timestamp_str:
                             try:
-                                # Tenta parsear diferentes formatos de timestamp
-                                if "T" in timestamp_str:
-                                    timestamp = datetime.fromisoformat(timestamp_str.replace("Z", "+00:00"))
-                                else:
-                                    timestamp = datetime.strptime(timestamp_str, "%Y-%m-%d")
+                                timestamp = _parse_timestamp(timestamp_str)
                                 
                                 timestamps.append({
                                     "datetime": timestamp,
@@ -66,7 +66,7 @@ class URLResolver:
     def _resolve_bing_url(self, url: str) -> str:
         """Resolve URLs específicas do Bing com decodificação Base64 dupla"""
         try:
-            logger.debug(f"🔍 Resolvendo URL do Bing: {url}")
+            logger.debug("🔍 Resolvendo URL do Bing: %s", url)
             
             # Extrai parâmetro u=a1...
             if "u=a1" in url:
@@ -78,7 +78,7 @@ class URLResolver:
                 
                 encoded_part = url[u_param_start:u_param_end]
                 
-                logger.debug(f"🔍 Parte codificada extraída: {encoded_part[:50]}...")
+                logger.debug("🔍 Parte codificada extraída: %.50s...", encoded_part)
                 
                 # Decodifica Base64 duplo
                 try:
@@ -92,7 +92,7 @@ class URLResolver:
                     
                     # Primeira decodificação
                     first_decode = base64.b64decode(encoded_part)
-                    logger.debug(f"🔍 Primeira decodificação: {first_decode[:50]}...")
+                    logger.debug("🔍 Primeira decodificação: %.50r...", first_decode)
                     
                     # Verifica se precisa de segunda decodificação
                     first_decode_str = first_decode.decode('utf-8', errors='ignore')
@@ -306,7 +306,9 @@ class VisualContentCapture:
             
             for session_dir in files_dir.iterdir():
                 if session_dir.is_dir():
-                    for screenshot in session_dir.glob("*.png"):
+                    for screenshot in session_dir.iterdir():
+                        if screenshot.suffix.lower() not in ('.png', '.jpg', '.jpeg'):
+                            continue
                         if screenshot.stat().st_mtime < cutoff_time:
                             screenshot.unlink()
                             removed_count += 1
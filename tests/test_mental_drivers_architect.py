@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testes do MentalDriversArchitect: cache/single-flight de chamadas à IA e tabela de drivers universais
+"""
+
+import os
+import sys
+import json
+import asyncio
+import threading
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from services.mental_drivers_architect import MentalDriversArchitect
+
+
+class _FakeAIManager:
+    """AIManager falso: conta as chamadas ao provedor e demora o bastante para as threads se sobreporem"""
+
+    def __init__(self):
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    async def generate_text(self, prompt, max_tokens=8192, temperature=0.7, json_mode=False):
+        with self._lock:
+            self.calls += 1
+        await asyncio.sleep(0.3)
+        return json.dumps({'drivers': [{'nome': 'Driver Teste', 'json_mode': json_mode}]})
+
+
+def test_prompts_identicos_simultaneos_fazem_uma_chamada_ao_provedor():
+    fake = _FakeAIManager()
+    architect = MentalDriversArchitect(fake)
+    avatar = {'dores_viscerais': ['falta de tempo']}
+    contexto = {'segmento': 'consultoria'}
+    resultados = []
+
+    def gerar():
+        resultados.append(architect._generate_customized_drivers([], avatar, contexto))
+
+    threads = [threading.Thread(target=gerar) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert fake.calls == 1
+    assert resultados[0] == resultados[1] == [{'nome': 'Driver Teste', 'json_mode': True}]
+
+
+def test_drivers_ideais_sao_copias_da_tabela_universal():
+    architect = MentalDriversArchitect(_FakeAIManager())
+    drivers = architect._identify_ideal_drivers({'dores_viscerais': ['falta de tempo']}, {})
+
+    drivers[0]['nome'] = 'Alterado'
+
+    assert architect._identify_ideal_drivers({'dores_viscerais': ['falta de tempo']}, {})[0]['nome'] == 'Urgência Temporal'
+    assert json.loads(json.dumps(drivers))[0]['nome'] == 'Alterado'